@@ -1,12 +1,38 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import orjson
+import copy
+import hashlib
+import string
 import openai
+import asyncio
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
 import tempfile
 import os
 import zipfile
 
+# Log level comes from the LOG_LEVEL env var; full payload dumps are only built at DEBUG
+logging.basicConfig(
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "WARNING").upper())
+
+def jdumps(obj, indent=False):
+    """Serialize to a JSON string with orjson (optionally pretty-printed)"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+
+def jloads(data):
+    """Parse JSON from str or bytes with orjson"""
+    return orjson.loads(data)
+
 # Hide the default menu
 st.set_page_config(
     page_title="Where's Spidey?", 
@@ -28,6 +54,10 @@ if 'current_content' not in st.session_state:
     st.session_state.current_content = None
 if 'parsed_nodes' not in st.session_state:
     st.session_state.parsed_nodes = None
+if 'pending_batches' not in st.session_state:
+    st.session_state.pending_batches = []
+if 'fetched_for_site_id' not in st.session_state:
+    st.session_state.fetched_for_site_id = None
 
 # Add sidebar configuration
 with st.sidebar:
@@ -59,66 +89,97 @@ with st.sidebar:
     if openai_key:
         st.session_state.openai_key = openai_key
 
-def get_pages(site_id, api_key):
-    """Get list of pages with their IDs"""
+# Static headers shared by every Webflow API request
+_BASE_HEADERS = {"accept": "application/json", "accept-version": "1.0.0"}
+
+@st.cache_resource
+def get_http() -> requests.Session:
+    """Get a shared keep-alive session for all Webflow API calls"""
+    session = requests.Session()
+    retry = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "POST"],
+        raise_on_status=False  # Let raise_for_status() report the final response
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    
+    # Default headers sent with every request
+    session.headers.update(_BASE_HEADERS)
+    return session
+
+def auth_headers(api_key):
+    """Per-request Webflow headers; the static ones are already set on the session"""
+    return {"authorization": f"Bearer {api_key}"}
+
+def api_key_digest(api_key):
+    """Short digest of an API key so the raw secret is never used as a cache key"""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_pages(site_id, api_key_hash, _api_key):
+    """Fetch the list of pages for a site (cached, raises on failure)"""
     url = f"https://api.webflow.com/v2/sites/{site_id}/pages"
-    headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}"
-    }
+    headers = auth_headers(_api_key)
     
-    print(f"\n[DEBUG] Fetching pages from URL: {url}")
+    logger.debug("Fetching pages from URL: %s", url)
+    response = get_http().get(url, headers=headers)
+    response.raise_for_status()
+    return jloads(response.content)["pages"]
+
+def get_pages(site_id, api_key):
+    """Get list of pages with their IDs"""
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        pages = response.json()["pages"]
-        print(f"[DEBUG] Successfully fetched {len(pages)} pages")
+        pages = fetch_pages(site_id, api_key_digest(api_key), _api_key=api_key)
+        logger.info("Successfully fetched %d pages", len(pages))
         return pages
     except Exception as e:
-        print(f"[DEBUG] Error fetching pages: {str(e)}")
+        logger.error("Error fetching pages: %s", e)
         st.error(f"Error fetching pages: {str(e)}")
         return []
 
-def get_site_locales(site_id, api_key):
-    """Get list of locales with their IDs"""
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_site_locales(site_id, api_key_hash, _api_key):
+    """Fetch the locales of a site (cached, raises on failure)"""
     url = f"https://api.webflow.com/v2/sites/{site_id}"
-    headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}"
-    }
+    headers = auth_headers(_api_key)
+    
+    response = get_http().get(url, headers=headers)
+    response.raise_for_status()
+    data = jloads(response.content)
+    
+    locales = []
+    # Add primary locale
+    primary = data.get('locales', {}).get('primary', {})
+    if primary:
+        primary['type'] = 'Primary'
+        locales.append(primary)
     
+    # Add secondary locales
+    secondary = data.get('locales', {}).get('secondary', [])
+    for locale in secondary:
+        locale['type'] = 'Secondary'
+        locales.append(locale)
+        
+    return locales
+
+def get_site_locales(site_id, api_key):
+    """Get list of locales with their IDs"""
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        
-        locales = []
-        # Add primary locale
-        primary = data.get('locales', {}).get('primary', {})
-        if primary:
-            primary['type'] = 'Primary'
-            locales.append(primary)
-        
-        # Add secondary locales
-        secondary = data.get('locales', {}).get('secondary', [])
-        for locale in secondary:
-            locale['type'] = 'Secondary'
-            locales.append(locale)
-            
-        return locales
+        return fetch_site_locales(site_id, api_key_digest(api_key), _api_key=api_key)
     except Exception as e:
-        print(f"\nERROR: {str(e)}")
+        logger.error("Error fetching site locales: %s", e)
         st.error(f"Error fetching site locales: {str(e)}")
         return []
 
-def get_page_content(page_id, api_key):
-    """Get page content using DOM endpoint with pagination handling"""
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_page_content(page_id, api_key_hash, _api_key):
+    """Fetch all DOM nodes of a page, following pagination (cached, raises on failure)"""
     base_url = f"https://api.webflow.com/v2/pages/{page_id}/dom"
-    headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}",
-        "accept-version": "1.0.0"
-    }
+    headers = auth_headers(_api_key)
     
     all_nodes = []
     offset = 0
@@ -128,10 +189,10 @@ def get_page_content(page_id, api_key):
         # Construct URL with pagination parameters
         url = f"{base_url}?limit={limit}&offset={offset}"
         
-        print(f"\nFetching nodes {offset} to {offset + limit}...")
-        response = requests.get(url, headers=headers)
+        logger.debug("Fetching nodes %d to %d...", offset, offset + limit)
+        response = get_http().get(url, headers=headers)
         response.raise_for_status()
-        data = response.json()
+        data = jloads(response.content)
         
         # Add nodes from this batch to our collection
         current_nodes = data.get('nodes', [])
@@ -141,7 +202,7 @@ def get_page_content(page_id, api_key):
         pagination = data.get('pagination', {})
         total = pagination.get('total', 0)
         
-        print(f"Retrieved {len(current_nodes)} nodes (Total: {len(all_nodes)}/{total})")
+        logger.debug("Retrieved %d nodes (Total: %d/%d)", len(current_nodes), len(all_nodes), total)
         
         # Check if we've got all nodes
         if len(all_nodes) >= total:
@@ -157,16 +218,17 @@ def get_page_content(page_id, api_key):
         "lastUpdated": data.get("lastUpdated")
     }
 
+def get_page_content(page_id, api_key):
+    """Get page content using DOM endpoint with pagination handling"""
+    return fetch_page_content(page_id, api_key_digest(api_key), _api_key=api_key)
+
 def validate_api_token(api_key):
     """Validate API token by making a test request"""
     url = "https://api.webflow.com/v2/sites"
-    headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}"
-    }
+    headers = auth_headers(api_key)
     
     try:
-        response = requests.get(url, headers=headers)
+        response = get_http().get(url, headers=headers)
         response.raise_for_status()
         return True
     except requests.exceptions.HTTPError as e:
@@ -183,61 +245,197 @@ def validate_api_token(api_key):
 
 def parse_page_content(content):
     """Parse page content and extract nodes with property overrides and text nodes"""
-    parsed_nodes = []
-    
-    for node in content.get('nodes', []):
-        node_data = {
-            "nodeId": node['id'],
-            "propertyOverrides": []
-        }
-        
-        # Handle text type nodes
-        if node.get('type') == 'text' and 'text' in node:
-            node_data["text"] = node['text'].get('html', '')
-            parsed_nodes.append(node_data)
-            continue
-        
-        # Handle nodes with property overrides
-        if node.get('propertyOverrides'):
-            for override in node['propertyOverrides']:
-                if 'propertyId' in override and 'text' in override:
-                    property_data = {
-                        "propertyId": override['propertyId'],
-                        "text": override['text'].get('text', '')
-                    }
-                    node_data["propertyOverrides"].append(property_data)
-            
-            if node_data["propertyOverrides"]:
-                parsed_nodes.append(node_data)
-    
-    return parsed_nodes
+    return [
+        # Text nodes carry their HTML directly; other nodes carry their text overrides
+        {"nodeId": node['id'], "propertyOverrides": [], "text": node['text'].get('html', '')}
+        if is_text
+        else {"nodeId": node['id'], "propertyOverrides": overrides}
+        for node in content.get('nodes', ())
+        if (is_text := node.get('type') == 'text' and 'text' in node)
+        or (overrides := [
+            {"propertyId": override['propertyId'], "text": override['text'].get('text', '')}
+            for override in node.get('propertyOverrides') or ()
+            if 'propertyId' in override and 'text' in override
+        ])
+    ]
 
-def display_curl_commands(page_id, locale_id, api_key, nodes):
-    """Display curl commands for each node"""
-    st.subheader("Generated CURL Commands")
-    
-    for node in nodes:
-        for prop in node["propertyOverrides"]:
-            curl_command = f"""curl -X POST "https://api.webflow.com/v2/pages/{page_id}/dom?localeId={locale_id}" \\
-     -H "Authorization: Bearer {api_key}" \\
+# Template for the curl command that pushes a single property override
+_CURL_TMPL = string.Template("""curl -X POST "https://api.webflow.com/v2/pages/$page_id/dom?localeId=$locale_id" \\
+     -H "Authorization: Bearer $api_key" \\
      -H "Content-Type: application/json" \\
-     -d '{{
+     -d '{
   "nodes": [
-    {{
-      "nodeId": "{node['nodeId']}",
+    {
+      "nodeId": "$node_id",
       "propertyOverrides": [
-        {{
-          "propertyId": "{prop['propertyId']}",
-          "text": "{prop['text']}"
-        }}
+        {
+          "propertyId": "$property_id",
+          "text": $text
+        }
       ]
-    }}
+    }
   ]
-}}'"""
-            st.code(curl_command, language="bash")
-            st.markdown("---")
+}'""")
+
+# Shell comment line separating the commands in the combined code block
+_CURL_SEPARATOR = "\n\n# " + "-" * 40 + "\n\n"
+
+def display_curl_commands(page_id, locale_id, api_key, nodes):
+    """Display curl commands for each node"""
+    st.subheader("Generated CURL Commands")
+    
+    blocks = [
+        _CURL_TMPL.substitute(
+            page_id=page_id,
+            locale_id=locale_id,
+            api_key=api_key,
+            node_id=node['nodeId'],
+            property_id=prop['propertyId'],
+            # JSON-escape the text, then escape single quotes for the shell
+            text=jdumps(prop['text']).replace("'", "'\\''")
+        )
+        for node in nodes
+        for prop in node["propertyOverrides"]
+    ]
+    
+    # Render every command in a single element instead of one code block per property
+    st.code(_CURL_SEPARATOR.join(blocks), language="bash")
+
+# Brand and product naming rules shared by every translation prompt
+TRANSLATION_RULES = """
+        - When encountering the word "Deriv" and any succeeding word, analyze the context and based on it, keep it in English. For example, "Deriv Blog," "Deriv Life," "Deriv Bot," and "Deriv App" should be kept in English.
+        - Keep product names such as P2P, MT5, Deriv X, Deriv cTrader, SmartTrader, Deriv Trader, Deriv GO, Deriv Bot, and Binary Bot in English.
+        """
+
+# Static system prompt for every translation request; the target language goes in the user
+# message so this prefix is identical across calls and can hit OpenAI's prompt cache
+TRANSLATION_SYSTEM_MESSAGE = f"""You are a professional translator with 20 years of experience.  
+        Translate only the "text" values in the JSON to the language the user asks for. 
+        Follow these rules when translating:
+        {TRANSLATION_RULES}
+        Keep all other JSON structure and values exactly the same.
+        Return only the JSON, no explanations."""
+
+# Chat completion parameters shared by the live and Batch API translation paths
+TRANSLATION_PARAMS = {
+    "model": "gpt-4o-mini",
+    "temperature": 0.3,
+    "seed": 0,
+    "response_format": {"type": "json_object"}
+}
+
+# Largest expected completion we allow a single multi-language request to produce
+MAX_BATCHED_OUTPUT_TOKENS = 12000
+
+# OpenAI account limits we pace requests below, so 429 back-offs never kick in
+REQUESTS_PER_MINUTE = 450
+TOKENS_PER_MINUTE = 180_000
 
-def translate_content_with_openai(parsed_nodes, target_language, api_key):
+def estimate_tokens(text):
+    """Roughly estimate the token count of a string (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+class TokenBucket:
+    """Thread-safe token bucket, shared by every session and event loop in the process"""
+    
+    def __init__(self, capacity, period):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def reserve(self, amount):
+        """Take tokens from the bucket and return how long to wait before they may be spent"""
+        amount = min(amount, self.capacity)
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            return max(0.0, -self.tokens / self.rate)
+    
+    async def acquire(self, amount=1):
+        """Wait until the requested number of tokens is available"""
+        delay = self.reserve(amount)
+        if delay:
+            await asyncio.sleep(delay)
+
+@st.cache_resource
+def get_rate_limiters():
+    """Get the process-wide (requests, tokens) per-minute limiters for OpenAI"""
+    return TokenBucket(REQUESTS_PER_MINUTE, 60), TokenBucket(TOKENS_PER_MINUTE, 60)
+
+async def stream_completion(client, messages, placeholder=None, expected_output_tokens=None):
+    """Stream a chat completion, showing the partial output in a placeholder, and return the full text"""
+    # Reserve rate-limit capacity for the prompt plus the expected answer before sending
+    prompt_tokens = sum(estimate_tokens(message["content"]) for message in messages)
+    if expected_output_tokens is None:
+        expected_output_tokens = prompt_tokens
+    request_limiter, token_limiter = get_rate_limiters()
+    await request_limiter.acquire()
+    await token_limiter.acquire(prompt_tokens + expected_output_tokens)
+    
+    stream = await client.chat.completions.create(
+        messages=messages,
+        stream=True,
+        **TRANSLATION_PARAMS
+    )
+    
+    buffer = ""
+    finish_reason = None
+    last_render = 0.0
+    async for chunk in stream:
+        if chunk.choices:
+            buffer += chunk.choices[0].delta.content or ""
+            finish_reason = chunk.choices[0].finish_reason or finish_reason
+        
+        # Refresh the partial output at most every 200ms
+        if placeholder is not None and time.monotonic() - last_render >= 0.2:
+            placeholder.code(buffer, language="json")
+            last_render = time.monotonic()
+    
+    if placeholder is not None:
+        placeholder.code(buffer, language="json")
+    
+    # JSON mode only guarantees valid JSON for complete answers
+    if finish_reason == "length":
+        raise ValueError("OpenAI response was cut off before the JSON was complete")
+    return buffer
+
+def serialize_nodes(parsed_nodes):
+    """Serialize nodes for the prompt as compact JSON, since indentation only adds input tokens"""
+    return jdumps({"nodes": parsed_nodes})
+
+def build_translation_messages(payload_str, instructions):
+    """Build the chat messages that translate the serialized nodes as described by the instructions.
+    
+    The system message and the payload come first and never change between languages, so the
+    shared prefix can be served from OpenAI's prompt cache."""
+    # Prepare the JSON for translation, wrapped in an object as JSON mode requires
+    user_message = f"Original JSON:\n{payload_str}\n\n{instructions}"
+    
+    return [
+        {"role": "system", "content": TRANSLATION_SYSTEM_MESSAGE},
+        {"role": "user", "content": user_message}
+    ]
+
+def single_language_instructions(target_language):
+    """Instructions asking for the nodes translated to one language"""
+    return f'Translate it to {target_language}. Return a JSON object of the form {{"nodes": [...]}}.'
+
+def check_translated_nodes(translated_nodes, parsed_nodes):
+    """Return an error message unless the translated nodes are node dicts matching the parsed node IDs"""
+    if not isinstance(translated_nodes, list):
+        return "Translated nodes are not a list"
+    if len(translated_nodes) != len(parsed_nodes):
+        return f"Expected {len(parsed_nodes)} translated nodes, got {len(translated_nodes)}"
+    for translated, original in zip(translated_nodes, parsed_nodes):
+        if not isinstance(translated, dict) or translated.get('nodeId') != original['nodeId']:
+            return f"Translated nodes don't match the original node IDs (at {original['nodeId']})"
+    return None
+
+async def translate_content_with_openai(parsed_nodes, target_language, client, placeholder=None, payload_str=None):
     """Translate content using OpenAI while preserving JSON structure"""
     try:
         # First verify we have valid inputs
@@ -245,79 +443,266 @@ def translate_content_with_openai(parsed_nodes, target_language, api_key):
             return None, "No content to translate"
         if not target_language:
             return None, "No target language specified"
-        if not api_key:
-            return None, "OpenAI API key is missing"
-            
-        client = openai.OpenAI(api_key=api_key)
         
-        # Print debug information
-        print("\n" + "="*50)
-        print("TRANSLATION REQUEST")
-        print("="*50)
-        print(f"Target Language: {target_language}")
-        print("Content to translate:")
-        print(json.dumps(parsed_nodes, indent=2))
-        
-        # Prepare the system message explaining what we want
-        system_message = f"""You are a professional translator with 20 years of experience.  
-        Translate only the "text" values in the JSON to {target_language}. 
-        Follow these rules when translating:
-
-        - When encountering the word "Deriv" and any succeeding word, analyze the context and based on it, keep it in English. For example, "Deriv Blog," "Deriv Life," "Deriv Bot," and "Deriv App" should be kept in English.
-        - Keep product names such as P2P, MT5, Deriv X, Deriv cTrader, SmartTrader, Deriv Trader, Deriv GO, Deriv Bot, and Binary Bot in English.
-        
-        Keep all other JSON structure and values exactly the same.
-        Return only the JSON, no explanations."""
+        # Log debug information
+        logger.debug("Translating %d nodes to %s", len(parsed_nodes), target_language)
         
-        # Prepare the JSON for translation
-        user_message = f"Translate this JSON content. Original JSON:\n{json.dumps(parsed_nodes, indent=2)}"
+        if payload_str is None:
+            payload_str = serialize_nodes(parsed_nodes)
         
         # Make the API call with new syntax
         try:
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=0.3
+            response_content = await stream_completion(
+                client,
+                build_translation_messages(payload_str, single_language_instructions(target_language)),
+                placeholder
             )
             
-            # Print the raw response for debugging
-            print("\nOpenAI Response:")
-            print(response)
+            # Log the raw response for debugging
+            logger.debug("OpenAI Response:\n%s", response_content)
             
-            # Extract and validate the response content
-            response_content = response.choices[0].message.content
+            # Validate the response content
             if not response_content:
                 return None, "Empty response from OpenAI"
                 
-            # Try to parse the JSON response
-            try:
-                translated_json = json.loads(response_content)
-                return translated_json, None
-            except json.JSONDecodeError as e:
-                print(f"JSON Parse Error: {str(e)}")
-                print("Raw response content:")
-                print(response_content)
-                return None, f"Failed to parse OpenAI response as JSON: {str(e)}"
+            # JSON mode guarantees a parseable object, but not that it has the nodes we sent
+            translated_nodes = jloads(response_content).get("nodes")
+            shape_error = check_translated_nodes(translated_nodes, parsed_nodes)
+            if shape_error:
+                return None, shape_error
+            return translated_nodes, None
                 
         except Exception as e:
-            print(f"OpenAI API Error: {str(e)}")
+            logger.error("OpenAI API Error: %s", e)
             return None, f"OpenAI API Error: {str(e)}"
             
     except Exception as e:
-        print(f"Unexpected Error: {str(e)}")
+        logger.error("Unexpected Error: %s", e)
         return None, f"Translation error: {str(e)}"
 
-def update_page_content(page_id, locale_id, api_key, translated_content):
-    """Update page content with translated text"""
+async def translate_content_batched(payload_str, target_languages, client, placeholder=None):
+    """Translate serialized nodes to several languages in a single OpenAI request, keyed by language tag"""
+    try:
+        tags = ", ".join(target_languages)
+        
+        logger.info("Batched translation request - Target Languages: %s", tags)
+        
+        instructions = (
+            f"Translate it to each of the following BCP-47 tags: {tags}. "
+            "Return a JSON object whose keys are these tags. Each value must be the translated "
+            'copy of the provided "nodes" array, preserving structure.'
+        )
+        
+        response_content = await stream_completion(
+            client,
+            build_translation_messages(payload_str, instructions),
+            placeholder,
+            expected_output_tokens=estimate_tokens(payload_str) * len(target_languages)
+        )
+        
+        if not response_content:
+            return None, "Empty response from OpenAI"
+        
+        translated_json = jloads(response_content)
+        missing = [tag for tag in target_languages if tag not in translated_json]
+        if missing:
+            return None, f"Response is missing languages: {', '.join(missing)}"
+        return translated_json, None
+    except Exception as e:
+        logger.error("Batched Translation Error: %s", e)
+        return None, f"Batched translation error: {str(e)}"
+
+async def translate_to_languages(parsed_nodes, target_languages, api_key, placeholder=None):
+    """Translate content to several languages, returning (content, error) per language.
+    
+    When a placeholder is given, the model output is shown in it while it streams in."""
+    if not api_key:
+        return [(None, "OpenAI API key is missing")] * len(target_languages)
+    
+    # Bound concurrency; request pacing is handled by the shared rate limiters
+    semaphore = asyncio.Semaphore(5)
+    
+    # Serialize the nodes once for every request below
+    payload_str = serialize_nodes(parsed_nodes)
+    
+    # Languages already translated by the batched request, mapped to (content, error)
+    results = {}
+    
+    async with openai.AsyncOpenAI(api_key=api_key) as client:
+        # Send the content once for all languages when the combined answer fits the budget
+        expected_tokens = estimate_tokens(payload_str) * len(target_languages)
+        if parsed_nodes and len(target_languages) > 1 and expected_tokens <= MAX_BATCHED_OUTPUT_TOKENS:
+            batched, error = await translate_content_batched(
+                payload_str, target_languages, client, placeholder
+            )
+            if error:
+                logger.warning("Falling back to per-language translation: %s", error)
+            else:
+                # Keep the languages whose nodes came back intact; the rest are retried one by one
+                for lang in target_languages:
+                    shape_error = check_translated_nodes(batched[lang], parsed_nodes)
+                    if shape_error:
+                        logger.warning("Falling back to per-language translation for %s: %s", lang, shape_error)
+                    else:
+                        results[lang] = (batched[lang], None)
+                if len(results) == len(target_languages):
+                    return [results[lang] for lang in target_languages]
+        
+        # Translate the remaining languages one request each
+        remaining = [lang for lang in target_languages if lang not in results]
+        
+        # One output slot per language so concurrent streams don't overwrite each other
+        slots = [None] * len(remaining)
+        if placeholder is not None:
+            container = placeholder.container()
+            slots = [container.empty() for _ in remaining]
+        
+        async def bounded(target_language, slot):
+            async with semaphore:
+                return await translate_content_with_openai(
+                    parsed_nodes, target_language, client, slot, payload_str=payload_str
+                )
+        
+        translated = await asyncio.gather(*(bounded(lang, slot) for lang, slot in zip(remaining, slots)))
+        results.update(zip(remaining, translated))
+    return [results[lang] for lang in target_languages]
+
+def submit_translation_batch(parsed_nodes, target_languages, api_key):
+    """Submit a Batch API job with one translation request per language, returning (batch_id, error)"""
+    try:
+        client = openai.OpenAI(api_key=api_key)
+        payload_str = serialize_nodes(parsed_nodes)
+        
+        # One JSONL line per language, identified by its language tag
+        lines = [
+            jdumps({
+                "custom_id": target_language,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "messages": build_translation_messages(payload_str, single_language_instructions(target_language)),
+                    **TRANSLATION_PARAMS
+                }
+            })
+            for target_language in target_languages
+        ]
+        
+        batch_file = client.files.create(
+            file=("translations.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info("Submitted translation batch %s for %d languages", batch.id, len(target_languages))
+        return batch.id, None
+    except Exception as e:
+        logger.error("Batch API Error: %s", e)
+        return None, f"Batch API Error: {str(e)}"
+
+def get_translation_batch_results(batch_id, api_key, parsed_nodes):
+    """Check a Batch API job, returning (status, {language tag: translated nodes}, {language tag: error}, error).
+    
+    Each language's nodes are validated against parsed_nodes; a bad line only fails its own language."""
+    try:
+        client = openai.OpenAI(api_key=api_key)
+        batch = client.batches.retrieve(batch_id)
+        
+        if batch.status in ("failed", "expired", "cancelled"):
+            return batch.status, None, {}, f"Batch {batch.status}"
+        if batch.status != "completed":
+            return batch.status, None, {}, None
+        if not batch.output_file_id:
+            return batch.status, None, {}, "Batch completed without any successful translations"
+        
+        results, language_errors = {}, {}
+        output = client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            tag = None
+            try:
+                record = jloads(line)
+                tag = record.get("custom_id")
+                body = (record.get("response") or {}).get("body") or {}
+                if record.get("error") or not body.get("choices"):
+                    language_errors[tag] = f"Request failed: {record.get('error') or 'no completion returned'}"
+                    continue
+                translated_nodes = jloads(body["choices"][0]["message"]["content"]).get("nodes")
+                shape_error = check_translated_nodes(translated_nodes, parsed_nodes)
+                if shape_error:
+                    language_errors[tag] = shape_error
+                else:
+                    results[tag] = translated_nodes
+            except Exception as e:
+                logger.error("Bad batch output line for %s: %s", tag, e)
+                language_errors[tag] = f"Unreadable batch output: {str(e)}"
+        
+        return batch.status, results, language_errors, None
+    except Exception as e:
+        logger.error("Batch API Error: %s", e)
+        return None, None, {}, f"Batch API Error: {str(e)}"
+
+def display_pending_batches():
+    """Show submitted Batch API translations and let the proofreader push finished ones"""
+    if not st.session_state.pending_batches:
+        return
+    
+    st.subheader("Pending Batch Translations")
+    for pending in list(st.session_state.pending_batches):
+        # Only poll OpenAI until the results have been downloaded once
+        if pending.get("results") is None:
+            status, results, language_errors, error = get_translation_batch_results(
+                pending["id"], st.session_state.openai_key, pending["parsed_nodes"]
+            )
+            pending["status"] = status or pending.get("status")
+            pending["results"] = results
+            pending["language_errors"] = language_errors
+            pending["error"] = error
+        
+        st.write(f"Batch `{pending['id']}` for page `{pending['page_id']}`: {pending['status']}")
+        if pending["error"]:
+            st.error(pending["error"])
+        for tag, language_error in pending["language_errors"].items():
+            label = pending["languages"].get(tag, {}).get("label", tag)
+            st.error(f"Batch translation for {label} failed: {language_error}")
+        
+        for tag, translated_content in (pending["results"] or {}).items():
+            language = pending["languages"][tag]
+            with st.expander(f"Batch Translation - {language['label']}", expanded=False):
+                edited_translation_str = st.text_area(
+                    "Full JSON (for advanced editing)",
+                    value=jdumps(translated_content, indent=True),
+                    height=300,
+                    key=f"batch_edit_{pending['id']}_{tag}"
+                )
+                if st.button(f"Approve and Push to Webflow - {language['label']}", key=f"batch_approve_{pending['id']}_{tag}"):
+                    try:
+                        success, error = update_page_content(
+                            page_id=pending["page_id"],
+                            locale_id=language["id"],
+                            api_key=st.session_state.api_key,
+                            translated_content=jloads(edited_translation_str)
+                        )
+                        if success:
+                            st.success(f"Successfully updated content for {language['label']}")
+                        else:
+                            st.error(f"Failed to update content for {language['label']}: {error}")
+                    except json.JSONDecodeError as e:
+                        st.error(f"Invalid JSON format: {str(e)}")
+        
+        if st.button("Dismiss", key=f"batch_dismiss_{pending['id']}"):
+            st.session_state.pending_batches.remove(pending)
+            st.rerun()
+
+def update_page_content(page_id, locale_id, api_key, translated_content, http=None):
+    """Update page content with translated text.
+    
+    Pass the shared session as http when calling from a worker thread."""
     url = f"https://api.webflow.com/v2/pages/{page_id}/dom?localeId={locale_id}"
-    headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}",
-        "content-type": "application/json"
-    }
+    headers = auth_headers(api_key) | {"content-type": "application/json"}
     
     # Restructure the translated content to match API requirements
     request_body = {
@@ -348,45 +733,33 @@ def update_page_content(page_id, locale_id, api_key, translated_content):
         
         request_body["nodes"].append(node_data)
     
-    print("\n" + "="*50)
-    print("UPDATE PAGE CONTENT REQUEST")
-    print("="*50)
-    print(f"URL: {url}")
-    print("\nHeaders:")
-    for key, value in headers.items():
-        if key.lower() == 'authorization':
-            print(f"{key}: Bearer ****{value[-4:]}")
-        else:
-            print(f"{key}: {value}")
-    
-    print("\nPayload:")
-    print(json.dumps(request_body, indent=2))
+    logger.info("Update page content request - URL: %s", url)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Payload:\n%s", jdumps(request_body, indent=True))
     
     try:
-        response = requests.post(url, headers=headers, json=request_body)
+        response = (http or get_http()).post(url, headers=headers, data=orjson.dumps(request_body))
         
-        print("\n" + "="*50)
-        print("API RESPONSE")
-        print("="*50)
-        print(f"Status Code: {response.status_code}")
-        try:
-            print(json.dumps(response.json(), indent=2))
-        except:
-            print(response.text)
+        logger.info("API response status code: %s", response.status_code)
+        if logger.isEnabledFor(logging.DEBUG):
+            try:
+                logger.debug("API response:\n%s", jdumps(jloads(response.content), indent=True))
+            except ValueError:
+                logger.debug("API response:\n%s", response.text)
             
         # Check for specific node errors in the response
         if response.status_code == 200:
-            response_data = response.json()
+            response_data = jloads(response.content)
             if response_data.get("errors"):
-                print("\nWarning: Some nodes had errors:")
+                logger.warning("Some nodes had errors:")
                 for error in response_data["errors"]:
-                    print(f"Node {error['nodeId']}: {error['error']}")
+                    logger.warning("Node %s: %s", error['nodeId'], error['error'])
         
         response.raise_for_status()
         return True, None
     except Exception as e:
         error_message = str(e)
-        print(f"\nERROR: {error_message}")
+        logger.error("Error updating page content: %s", error_message)
         return False, error_message
 
 def main():
@@ -395,14 +768,16 @@ def main():
     # Add the image at the top
     st.image("jameson.webp", caption="J. Jonah Jameson")
     
-    # Print current session state
-    print("\nCurrent Session State:")
-    print(f"Has site_id: {bool(st.session_state.site_id)}")
-    print(f"Has api_key: {bool(st.session_state.api_key)}")
-    print(f"Number of pages: {len(st.session_state.pages)}")
-    print(f"Number of locales: {len(st.session_state.locales)}")
-    print(f"Has OpenAI key: {bool(st.session_state.openai_key)}")
-    print(f"Has current content: {bool(st.session_state.current_content)}")
+    # Log current session state
+    logger.debug(
+        "Current session state - site_id: %s, api_key: %s, pages: %d, locales: %d, OpenAI key: %s, content: %s",
+        bool(st.session_state.site_id),
+        bool(st.session_state.api_key),
+        len(st.session_state.pages),
+        len(st.session_state.locales),
+        bool(st.session_state.openai_key),
+        bool(st.session_state.current_content)
+    )
     
     # Step 1: Get API Token and Site ID
     with st.form("credentials_form"):
@@ -425,41 +800,67 @@ def main():
             value=st.session_state.api_key,
             help="Your Webflow API token with pages:read scope"
         )
+        force_refresh = st.checkbox(
+            "Force refresh",
+            help="Discard cached Webflow data and fetch it again"
+        )
         submit_button = st.form_submit_button("Validate & Fetch Site Data")
     
     if submit_button:
+        if force_refresh:
+            fetch_pages.clear()
+            fetch_site_locales.clear()
+            fetch_page_content.clear()
+        
+        # Reuse what is already in session state when this site was fetched with the same token
+        already_fetched = (
+            not force_refresh
+            and site_id == st.session_state.fetched_for_site_id
+            and api_key == st.session_state.api_key
+        )
+        
+        locales, pages = [], []
+        if already_fetched:
+            locales = st.session_state.locales
+            pages = st.session_state.pages
         # First validate the API token
-        if validate_api_token(api_key):
+        elif validate_api_token(api_key):
             st.success("API token validated successfully!")
-            st.session_state.site_id = site_id
-            st.session_state.api_key = api_key
             
             # Step 2: Get Pages and Locales
             with st.spinner("Fetching site data..."):
-                # Get and display locales
                 locales = get_site_locales(site_id, api_key)
-                if locales:
-                    st.session_state.locales = locales
-                    st.subheader("Available Locales")
-                    locale_data = {
-                        "Type": [locale.get('type', 'Unknown') for locale in locales],
-                        "Display Name": [locale.get('displayName', 'Unnamed') for locale in locales],
-                        "Locale ID": [locale.get('id', 'No ID') for locale in locales],
-                        "Tag": [locale.get('tag', 'No tag') for locale in locales]
-                    }
-                    st.table(locale_data)
-                
-                # Uncomment these lines to fetch pages
                 pages = get_pages(site_id, api_key)
-                if pages:
-                    st.session_state.pages = pages
-                    st.subheader("Available Pages")
-                    page_data = {
-                        "Title": [page.get('title', 'Untitled') for page in pages],
-                        "Page ID": [page['id'] for page in pages],
-                        "Slug": [page.get('slug', 'No slug') for page in pages]
-                    }
-                    st.table(page_data)
+            
+            # Store the fetched site data together, only marking the site as fetched if both succeeded
+            st.session_state.update({
+                "site_id": site_id,
+                "api_key": api_key,
+                "locales": locales or st.session_state.locales,
+                "pages": pages or st.session_state.pages,
+                "fetched_for_site_id": site_id if locales and pages else None
+            })
+        
+        # Display locales
+        if locales:
+            st.subheader("Available Locales")
+            locale_data = {
+                "Type": [locale.get('type', 'Unknown') for locale in locales],
+                "Display Name": [locale.get('displayName', 'Unnamed') for locale in locales],
+                "Locale ID": [locale.get('id', 'No ID') for locale in locales],
+                "Tag": [locale.get('tag', 'No tag') for locale in locales]
+            }
+            st.table(locale_data)
+        
+        # Display pages
+        if pages:
+            st.subheader("Available Pages")
+            page_data = {
+                "Title": [page.get('title', 'Untitled') for page in pages],
+                "Page ID": [page['id'] for page in pages],
+                "Slug": [page.get('slug', 'No slug') for page in pages]
+            }
+            st.table(page_data)
     
     # Page selection and content viewing
     if st.session_state.pages:
@@ -516,29 +917,75 @@ def main():
                         key="translate_languages_select"
                     )
                     
+                    # Proofreaders don't need an immediate push, so they can use the cheaper Batch API
+                    use_batch_api = False
+                    if user_role == "Proofreader":
+                        use_batch_api = st.checkbox(
+                            "Use Batch API (cheaper, async)",
+                            help="Translations are processed by OpenAI within 24 hours at a lower cost",
+                            key="use_batch_api"
+                        )
+                    
+                    display_pending_batches()
+                    
                     if st.button("Translate to Selected Languages", key="translate_button"):
                         if not target_languages:
                             st.warning("Please select at least one language")
                             return
+                        
+                        if use_batch_api:
+                            batch_id, error = submit_translation_batch(
+                                st.session_state.parsed_nodes,
+                                [locale_options[lang]['tag'] for lang in target_languages],
+                                st.session_state.openai_key
+                            )
+                            if error:
+                                st.error(error)
+                            else:
+                                st.session_state.pending_batches.append({
+                                    "id": batch_id,
+                                    "page_id": page_id,
+                                    "status": "validating",
+                                    "results": None,
+                                    "language_errors": {},
+                                    "error": None,
+                                    # Kept to validate the returned nodes against what was sent
+                                    "parsed_nodes": st.session_state.parsed_nodes,
+                                    "languages": {
+                                        locale_options[lang]['tag']: {"label": lang, "id": locale_options[lang]['id']}
+                                        for lang in target_languages
+                                    }
+                                })
+                                st.success(f"Submitted batch {batch_id}. Results will appear here once OpenAI completes it.")
+                            return
                             
-                        print(f"\nTranslating to {len(target_languages)} languages")
+                        logger.info("Translating to %d languages", len(target_languages))
                         
                         # Create a progress bar
                         progress_bar = st.progress(0)
                         translation_status = st.empty()
                         
+                        # Translate to all languages concurrently, using the language tags
+                        stream_output = st.empty()
+                        with st.spinner(f"Translating to {len(target_languages)} languages..."):
+                            language_results = asyncio.run(translate_to_languages(
+                                st.session_state.parsed_nodes,
+                                [locale_options[lang]['tag'] for lang in target_languages],
+                                st.session_state.openai_key,
+                                placeholder=stream_output
+                            ))
+                        stream_output.empty()
+                        
+                        # Designer/Content Writer updates, pushed to Webflow together after the loop
+                        updates = []
+                        
                         # Process each language
                         for index, target_language in enumerate(target_languages):
                             translation_status.text(f"Processing {target_language} ({index + 1}/{len(target_languages)})")
-                            print(f"\nProcessing language: {target_language}")
+                            logger.info("Processing language: %s", target_language)
                             
-                            with st.spinner(f"Translating to {target_language}..."):
-                                # Use the language tag for translation
-                                translated_content, error = translate_content_with_openai(
-                                    st.session_state.parsed_nodes,
-                                    locale_options[target_language]['tag'],
-                                    st.session_state.openai_key
-                                )
+                            with st.spinner(f"Processing {target_language}..."):
+                                translated_content, error = language_results[index]
                                 
                                 if error:
                                     st.error(f"Error translating to {target_language}: {error}")
@@ -546,8 +993,7 @@ def main():
                                 
                                 # Get the locale ID for the API call
                                 locale_id = locale_options[target_language]['id']
-                                print(f"\nUsing locale ID: {locale_id}")
-                                print(f"Language tag: {locale_options[target_language]['tag']}")
+                                logger.debug("Using locale ID: %s, language tag: %s", locale_id, locale_options[target_language]['tag'])
                                 
                                 # Create an expander for each language's details
                                 with st.expander(f"Translation Details - {target_language}", expanded=False):
@@ -556,18 +1002,8 @@ def main():
                                 
                                 # Handle content update based on user role
                                 if user_role == "Designer/Content Writer":
-                                    # Update the page content immediately
-                                    success, error = update_page_content(
-                                        page_id=page_id,
-                                        locale_id=locale_id,
-                                        api_key=st.session_state.api_key,
-                                        translated_content=translated_content
-                                    )
-                                    
-                                    if success:
-                                        st.success(f"Successfully updated content for {target_language}")
-                                    else:
-                                        st.error(f"Failed to update content for {target_language}: {error}")
+                                    # Queue the page content update
+                                    updates.append((target_language, locale_id, translated_content))
                                 else:  # Proofreader role
                                     st.write("### Proofreader Review Required")
                                     st.write("Please review and edit the translations below (if required), then click the button to push the update to Webflow.")
@@ -580,22 +1016,22 @@ def main():
                                         # Show the full JSON structure
                                         edited_translation_str = st.text_area(
                                             "Full JSON (for advanced editing)",
-                                            value=json.dumps(translated_content, indent=2),
+                                            value=jdumps(translated_content, indent=True),
                                             height=300,
                                             key=f"translation_edit_json_{index}"
                                         )
 
                                     with col2:
                                         st.subheader("Translations Only")
-                                        # Extract and display only the text fields for easier editing
-                                        translations = []
-                                        for node in translated_content:
-                                            for override in node.get('propertyOverrides', []):
-                                                if 'text' in override:
-                                                    translations.append(override['text'])
-                                        
+                                        # Extract only the text fields for easier editing
+                                        override_texts = [
+                                            override['text']
+                                            for node in translated_content
+                                            for override in node.get('propertyOverrides', [])
+                                            if 'text' in override
+                                        ]
                                         # Join translations with newlines for readability
-                                        translation_text = '\n'.join(translations)
+                                        translation_text = '\n'.join(override_texts)
                                         edited_translations = st.text_area(
                                             "Edit Translations",
                                             value=translation_text,
@@ -606,13 +1042,13 @@ def main():
                                     try:
                                         # Only update if there are actual changes
                                         if edited_translations != translation_text:
-                                            print(f"\nUpdating translations. Original:\n{translation_text}\nEdited:\n{edited_translations}")
+                                            logger.debug("Updating translations. Original:\n%s\nEdited:\n%s", translation_text, edited_translations)
                                             
                                             edited_translations_list = edited_translations.split('\n')
                                             translation_index = 0
                                             
                                             # Create a deep copy of the original content
-                                            updated_content = json.loads(json.dumps(translated_content))
+                                            updated_content = copy.deepcopy(translated_content)
                                             
                                             # Update the translations in the JSON structure
                                             for node in updated_content:
@@ -622,19 +1058,19 @@ def main():
                                                         translation_index += 1
                                             
                                             # Update the JSON string
-                                            edited_translation_str = json.dumps(updated_content, indent=2)
-                                            print(f"\nUpdated JSON structure:\n{edited_translation_str}")
+                                            edited_translation_str = jdumps(updated_content, indent=True)
+                                            logger.debug("Updated JSON structure:\n%s", edited_translation_str)
                                     except Exception as e:
                                         st.error(f"Error updating translations: {str(e)}")
-                                        print(f"\nError while updating translations: {str(e)}")
+                                        logger.error("Error while updating translations: %s", e)
                                     
                                     if st.button(f"Approve and Push to Webflow - {target_language}", key=f"approve_{index}"):
                                         try:
                                             # Use the appropriate content based on which was last edited
-                                            final_content = json.loads(edited_translation_str)
+                                            final_content = jloads(edited_translation_str)
                                             
-                                            print("\nSending to Webflow:")
-                                            print(json.dumps(final_content, indent=2))
+                                            if logger.isEnabledFor(logging.DEBUG):
+                                                logger.debug("Sending to Webflow:\n%s", jdumps(final_content, indent=True))
                                             
                                             success, error = update_page_content(
                                                 page_id=page_id,
@@ -649,17 +1085,37 @@ def main():
                                                 st.error(f"Failed to update content for {target_language}: {error}")
                                         except json.JSONDecodeError as e:
                                             st.error(f"Invalid JSON format: {str(e)}")
-                                            print(f"\nJSON Decode Error: {str(e)}")
-                                            print(f"Problematic JSON:\n{edited_translation_str}")
+                                            logger.error("JSON Decode Error: %s\nProblematic JSON:\n%s", e, edited_translation_str)
                                         except Exception as e:
                                             st.error(f"Error during update: {str(e)}")
                                 
                                 # Update progress
                                 progress = (index + 1) / len(target_languages)
                                 progress_bar.progress(progress)
-                                
-                                # Add a small delay between requests to avoid rate limits
-                                time.sleep(1)
+                        
+                        # Push all queued updates in parallel over the pooled session
+                        if updates:
+                            translation_status.text(f"Updating {len(updates)} locales on Webflow...")
+                            http = get_http()
+                            with ThreadPoolExecutor(max_workers=min(8, len(updates))) as executor:
+                                futures = {
+                                    executor.submit(
+                                        update_page_content,
+                                        page_id,
+                                        locale_id,
+                                        st.session_state.api_key,
+                                        content,
+                                        http
+                                    ): target_language
+                                    for target_language, locale_id, content in updates
+                                }
+                                for future in as_completed(futures):
+                                    target_language = futures[future]
+                                    success, error = future.result()
+                                    if success:
+                                        st.success(f"Successfully updated content for {target_language}")
+                                    else:
+                                        st.error(f"Failed to update content for {target_language}: {error}")
                         
                         translation_status.text("All translations completed!")
                         
@@ -1,24 +1,63 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import copy
+import logging
+import os
+import pandas as pd
 import openai
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Use orjson for JSON (de)serialization when available, falling back to the stdlib
+try:
+    import orjson
+
+    def jdumps(obj, sort_keys=False):
+        """Serialize to a JSON string with orjson"""
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode()
+
+    jloads = orjson.loads
+except ImportError:
+    def jdumps(obj, sort_keys=False):
+        """Serialize to a JSON string with the stdlib json module"""
+        return json.dumps(obj, sort_keys=sort_keys, ensure_ascii=False)
+
+    jloads = json.loads
+
+# Debug logging (full request and response dumps) is enabled with the WEBFLOW_DEBUG env var
+DEBUG = bool(os.getenv("WEBFLOW_DEBUG"))
+logging.basicConfig(
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+log = logging.getLogger(__name__)
+log.setLevel(logging.DEBUG if DEBUG else logging.WARNING)
 
 # Set page config
 st.set_page_config(page_title="Webflow Content Manager", layout="wide")
 
 # Initialize session state
-if 'site_id' not in st.session_state:
-    st.session_state.site_id = ''
-if 'api_key' not in st.session_state:
-    st.session_state.api_key = ''
-if 'openai_key' not in st.session_state:
-    st.session_state.openai_key = ''
-if 'components' not in st.session_state:
-    st.session_state.components = []
-if 'current_component_content' not in st.session_state:
-    st.session_state.current_component_content = None
-if 'parsed_nodes' not in st.session_state:
-    st.session_state.parsed_nodes = None
+_DEFAULTS = {
+    'site_id': '',
+    'api_key': '',
+    'openai_key': '',
+    'components': [],
+    'current_component_content': None,
+    'parsed_nodes': None,
+    'locales': [],
+    'model': "gpt-4o-mini",
+    'selected_component_id': None,
+}
+for key, value in _DEFAULTS.items():
+    # Copy mutable defaults so sessions never share the same list
+    st.session_state.setdefault(key, copy.copy(value))
 
 # Add navigation in sidebar
 with st.sidebar:
@@ -44,114 +83,359 @@ with st.sidebar:
     )
     if openai_key:
         st.session_state.openai_key = openai_key
+    
+    st.session_state.model = st.selectbox(
+        "Model",
+        ["gpt-4o-mini", "gpt-4o", "gpt-4"],
+        index=0,
+        help="OpenAI model used for translations"
+    )
 
-def get_site_components(site_id, api_key):
-    """Get list of components from the site"""
-    url = f"https://api.webflow.com/v2/sites/{site_id}/components"
-    headers = {
+# (connect, read) timeouts for Webflow calls, so a stalled connection can't hang the script thread
+WEBFLOW_TIMEOUT = (3.05, 30)
+
+class LoggingRetry(Retry):
+    """urllib3 Retry that logs a warning for every retried request"""
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        log.warning(
+            "Retrying %s %s after %s",
+            method, url, error or (response.status if response else "unknown failure")
+        )
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+@st.cache_resource
+def get_webflow_session(api_key):
+    """Get a keep-alive session for the Webflow API, authenticated with the given key"""
+    session = requests.Session()
+    session.headers.update({
         "accept": "application/json",
         "authorization": f"Bearer {api_key}"
+    })
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        # Back off exponentially on rate limits and server errors, honoring Retry-After on 429s
+        max_retries=LoggingRetry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "POST"],
+            respect_retry_after_header=True,
+            raise_on_status=False  # Let raise_for_status() report the final response
+        )
+    )
+    session.mount("https://", adapter)
+    return session
+
+def masked_headers(headers):
+    """Return headers with the bearer token masked, for debug logging"""
+    return {
+        key: f"Bearer ****{value[-4:]}" if key.lower() == 'authorization' else value
+        for key, value in headers.items()
     }
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_site_components(site_id, api_key):
+    """Fetch the components of a site (cached, raises on failure)"""
+    url = f"https://api.webflow.com/v2/sites/{site_id}/components"
     
-    print(f"\n[DEBUG] Fetching components from URL: {url}")
+    log.debug("Fetching components from URL: %s", url)
+    response = get_webflow_session(api_key).get(url, timeout=WEBFLOW_TIMEOUT)
+    response.raise_for_status()
+    return jloads(response.content)["components"]
+
+def get_site_components(site_id, api_key):
+    """Get list of components from the site"""
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        components = response.json()["components"]
-        print(f"[DEBUG] Successfully fetched {len(components)} components")
+        components = fetch_site_components(site_id, api_key)
+        log.info("Successfully fetched %d components", len(components))
         return components
+    except requests.Timeout:
+        log.error("Timed out fetching components")
+        st.error("Timed out fetching components from Webflow, please try again")
+        return []
     except Exception as e:
-        print(f"[DEBUG] Error fetching components: {str(e)}")
+        log.error("Error fetching components: %s", e)
         st.error(f"Error fetching components: {str(e)}")
         return []
 
-def get_component_content(site_id, component_id, api_key):
-    """Get component content using DOM endpoint"""
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_component_content(site_id, component_id, api_key):
+    """Fetch the DOM of a component (cached, raises on failure)"""
     url = f"https://api.webflow.com/v2/sites/{site_id}/components/{component_id}/dom"
-    headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}",
-        "accept-version": "1.0.0"
-    }
+    session = get_webflow_session(api_key)
+    headers = {"accept-version": "1.0.0"}
+    
+    if DEBUG:
+        log.debug("Get component content - URL: %s, headers: %s", url, masked_headers({**session.headers, **headers}))
     
-    print("\n" + "="*50)
-    print("API REQUEST - Get Component Content")
-    print("="*50)
-    print(f"URL: {url}")
-    print("\nHeaders:")
-    for key, value in headers.items():
-        if key.lower() == 'authorization':
-            print(f"{key}: Bearer ****{value[-4:]}")
-        else:
-            print(f"{key}: {value}")
+    response = session.get(url, headers=headers, timeout=WEBFLOW_TIMEOUT)
+    response.raise_for_status()
+    data = jloads(response.content)
     
+    # Log the complete API response; %s formatting is lazy, so nothing is serialized when disabled
+    log.debug("Component content response: %s", data)
+    
+    return data
+
+def get_component_content(site_id, component_id, api_key):
+    """Get component content using DOM endpoint"""
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Print the complete API response
-        print("\n" + "="*50)
-        print("COMPLETE API RESPONSE")
-        print("="*50)
-        print(json.dumps(data, indent=2))
-        
-        return data
+        return fetch_component_content(site_id, component_id, api_key)
+    except requests.Timeout:
+        log.error("Timed out fetching component content")
+        st.error("Timed out fetching component content from Webflow, please try again")
+        return None
     except Exception as e:
-        print(f"\nERROR: {str(e)}")
+        log.error("Error fetching component content: %s", e)
         st.error(f"Error fetching component content: {str(e)}")
         return None
 
+def iter_text_nodes(content):
+    """Yield (node ID, HTML) pairs for the nodes of a component that have non-empty html"""
+    return (
+        (node['id'], html)  # Getting HTML instead of plain text
+        for node in content.get('nodes', ())
+        if (text := node.get('text')) and (html := text.get('html'))
+    )
+
 def parse_component_content(content):
-    """Parse component content to extract node IDs and HTML"""
-    parsed_nodes = []
+    """Parse component content into parallel lists of node IDs and HTML"""
+    ids, texts = [], []
+    for node_id, html in iter_text_nodes(content):
+        ids.append(node_id)
+        texts.append(html)
+    return {"ids": ids, "texts": texts}
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_site_locales(site_id, api_key):
+    """Fetch the locales of a site (cached, raises on failure)"""
+    url = f"https://api.webflow.com/v2/sites/{site_id}"
+    
+    log.debug("Fetching site locales from URL: %s", url)
+    response = get_webflow_session(api_key).get(url, timeout=WEBFLOW_TIMEOUT)
+    response.raise_for_status()
+    data = jloads(response.content)
     
-    for node in content.get('nodes', []):
-        # Only include nodes that have non-empty html
-        if node.get('text', {}).get('html'):
-            node_data = {
-                "nodeId": node['id'],
-                "text": node['text']['html']  # Getting HTML instead of plain text
-            }
-            parsed_nodes.append(node_data)
+    locales = []
+    # Add primary locale
+    primary = data.get('locales', {}).get('primary', {})
+    if primary:
+        primary['type'] = 'Primary'
+        locales.append(primary)
     
-    return {"nodes": parsed_nodes}
+    # Add secondary locales
+    secondary = data.get('locales', {}).get('secondary', [])
+    for locale in secondary:
+        locale['type'] = 'Secondary'
+        locales.append(locale)
+    
+    return locales
 
 def get_site_locales(site_id, api_key):
     """Get list of locales with their IDs"""
-    url = f"https://api.webflow.com/v2/sites/{site_id}"
-    headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}"
-    }
-    
-    print(f"\n[DEBUG] Fetching site locales from URL: {url}")
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        
-        locales = []
-        # Add primary locale
-        primary = data.get('locales', {}).get('primary', {})
-        if primary:
-            primary['type'] = 'Primary'
-            locales.append(primary)
-        
-        # Add secondary locales
-        secondary = data.get('locales', {}).get('secondary', [])
-        for locale in secondary:
-            locale['type'] = 'Secondary'
-            locales.append(locale)
-            
-        print(f"[DEBUG] Successfully fetched {len(locales)} locales")
+        locales = fetch_site_locales(site_id, api_key)
+        log.info("Successfully fetched %d locales", len(locales))
         return locales
+    except requests.Timeout:
+        log.error("Timed out fetching locales")
+        st.error("Timed out fetching site locales from Webflow, please try again")
+        return []
     except Exception as e:
-        print(f"[DEBUG] Error fetching locales: {str(e)}")
+        log.error("Error fetching locales: %s", e)
         st.error(f"Error fetching site locales: {str(e)}")
         return []
 
-def translate_content_with_openai(parsed_nodes, target_language, api_key):
+@st.cache_data(show_spinner=False)
+def component_views(components_json):
+    """Build the components table and selector options in one pass, once per distinct components list"""
+    rows, options_to_id = [], {}
+    for comp in jloads(components_json):
+        name = comp.get('name', 'Unnamed')
+        comp_id = comp['id']
+        rows.append({"Name": name, "Component ID": comp_id, "Type": comp.get('type', 'Unknown')})
+        options_to_id[f"{name} ({comp_id})"] = comp_id
+    return pd.DataFrame(rows), options_to_id
+
+@st.cache_data(show_spinner=False)
+def locales_df(locales_json):
+    """Build the locales table once per distinct locales list"""
+    return pd.DataFrame([
+        {
+            "Name": locale.get('displayName', 'Unnamed'),
+            "Tag": locale.get('tag', 'No tag'),
+            "Type": locale.get('type', 'Unknown')
+        }
+        for locale in jloads(locales_json)
+    ])
+
+@st.cache_data(show_spinner=False)
+def build_locale_options(locales_json):
+    """Build the target-language options with their locale tags and IDs, once per distinct locales list"""
+    return {
+        f"{locale.get('displayName', 'Unnamed')} ({locale.get('tag', 'No tag')})": {
+            'tag': locale.get('tag', 'unknown'),
+            'id': locale.get('id')
+        }
+        for locale in jloads(locales_json)
+    }
+
+# Upper bounds on the strings and estimated input tokens sent per OpenAI request,
+# and how many of those requests may run at once
+MAX_TEXTS_PER_REQUEST = 20
+MAX_TOKENS_PER_REQUEST = 1500
+MAX_CONCURRENT_REQUESTS = 5
+
+# Prompt version, part of the translation cache key along with the model
+PROMPT_VERSION = 3
+
+# On-disk cache of translated node HTML, kept for 30 days
+TRANSLATION_CACHE_PATH = ".translate_cache.sqlite3"
+TRANSLATION_CACHE_TTL = 86400 * 30
+
+class TranslationCache:
+    """SQLite-backed cache of translated strings keyed on a content hash"""
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def key(html, target_language, model):
+        return hashlib.sha256(
+            f"{model}|{target_language}|{PROMPT_VERSION}|{html}".encode()
+        ).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM translations WHERE key = ? AND created > ?",
+                (key, time.time() - TRANSLATION_CACHE_TTL)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_many(self, items):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations (key, value, created) VALUES (?, ?, ?)",
+                [(key, value, time.time()) for key, value in items]
+            )
+            self._conn.commit()
+
+def estimate_tokens(text):
+    """Roughly estimate the token count of a string (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+def chunk_indices(indices, texts):
+    """Group indices into runs bounded by MAX_TEXTS_PER_REQUEST and MAX_TOKENS_PER_REQUEST"""
+    chunk, chunk_tokens = [], 0
+    for i in indices:
+        tokens = estimate_tokens(texts[i])
+        if chunk and (len(chunk) == MAX_TEXTS_PER_REQUEST or chunk_tokens + tokens > MAX_TOKENS_PER_REQUEST):
+            yield chunk
+            chunk, chunk_tokens = [], 0
+        chunk.append(i)
+        chunk_tokens += tokens
+    if chunk:
+        yield chunk
+
+@st.cache_resource
+def get_translation_cache():
+    """Get the process-wide translation cache"""
+    return TranslationCache(TRANSLATION_CACHE_PATH)
+
+async def translate_texts_batch(client, semaphore, texts, target_language, model, placeholder=None):
+    """Translate a small batch of HTML strings, returning them in the same order.
+    
+    The response is streamed, and shown in the placeholder as it arrives when one is given."""
+    # Prepare the system message explaining what we want
+    system_message = f"""You are a professional translator. Do not translate the HTML tags.
+        Translate each string in the given JSON array to {target_language}.
+        Return a JSON object {{"translations": [...]}} whose array has the same length and order."""
+    
+    # Send the strings as a flat array, without node IDs or any other envelope
+    user_message = jdumps(texts)
+    
+    async with semaphore:
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": user_message}
+            ],
+            temperature=0.3,
+            response_format={"type": "json_object"},
+            stream=True
+        )
+        
+        response_content = ""
+        finish_reason = None
+        last_render = 0.0
+        async for chunk in stream:
+            if chunk.choices:
+                response_content += chunk.choices[0].delta.content or ""
+                finish_reason = chunk.choices[0].finish_reason or finish_reason
+            
+            # Refresh the partial output at most every 200ms
+            if placeholder is not None and time.monotonic() - last_render >= 0.2:
+                placeholder.code(response_content, language="json")
+                last_render = time.monotonic()
+    
+    if placeholder is not None:
+        placeholder.code(response_content, language="json")
+    
+    # Log the raw response for debugging
+    log.debug("OpenAI Response: %s", response_content)
+    
+    # Extract and validate the response content
+    if not response_content:
+        raise ValueError("Empty response from OpenAI")
+    if finish_reason == "length":
+        raise ValueError("OpenAI response was cut off before the JSON was complete")
+    
+    translated_texts = jloads(response_content).get("translations")
+    if not isinstance(translated_texts, list) or len(translated_texts) != len(texts):
+        raise ValueError(f"Expected a JSON array of {len(texts)} strings from OpenAI")
+    return [str(text) for text in translated_texts]
+
+async def translate_all_texts(texts, target_language, api_key, model, placeholder=None):
+    """Translate HTML strings in token-bounded batches concurrently, preserving their order"""
+    # Serve previously translated HTML from the cache and only send the misses to OpenAI
+    cache = get_translation_cache()
+    keys = [cache.key(text, target_language, model) for text in texts]
+    translated = [cache.get(key) for key in keys]
+    misses = [i for i, text in enumerate(translated) if text is None]
+    log.info("Translation cache: %d hits, %d misses", len(texts) - len(misses), len(misses))
+    
+    if misses:
+        # The SDK retries rate-limited requests with exponential backoff, honoring retry-after
+        async with openai.AsyncOpenAI(api_key=api_key, max_retries=5) as client:
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+            batches = list(chunk_indices(misses, texts))
+            log.info("Translating %d strings in %d requests", len(misses), len(batches))
+            
+            # Give every request its own slot so concurrent streams don't overwrite each other
+            slots = [None] * len(batches)
+            if placeholder is not None:
+                container = placeholder.container()
+                slots = [container.empty() for _ in batches]
+            
+            results = await asyncio.gather(
+                *(translate_texts_batch(client, semaphore, [texts[j] for j in batch], target_language, model, slot)
+                  for batch, slot in zip(batches, slots))
+            )
+        for batch, batch_texts in zip(batches, results):
+            for j, text in zip(batch, batch_texts):
+                translated[j] = text
+        cache.set_many((keys[j], translated[j]) for j in misses)
+    
+    return translated
+
+def translate_content_with_openai(parsed_nodes, target_language, api_key, model="gpt-4o-mini", placeholder=None):
     """Translate content using OpenAI while preserving JSON structure"""
     try:
         # First verify we have valid inputs
@@ -161,104 +445,178 @@ def translate_content_with_openai(parsed_nodes, target_language, api_key):
             return None, "No target language specified"
         if not api_key:
             return None, "OpenAI API key is missing"
-            
-        client = openai.OpenAI(api_key=api_key)
-        
-        # Print debug information
-        print("\n" + "="*50)
-        print("TRANSLATION REQUEST")
-        print("="*50)
-        print(f"Target Language: {target_language}")
-        print("Content to translate:")
-        print(json.dumps(parsed_nodes, indent=2))
-        
-        # Prepare the system message explaining what we want
-        system_message = f"""You are a professional translator. Do not translate the HTML tags.
-        Translate only the "text" values in the JSON to {target_language}. 
-        Keep all other JSON structure and values exactly the same.
-        Return only the JSON, no explanations."""
         
-        # Prepare the JSON for translation
-        user_message = f"Translate this JSON content. Original JSON:\n{json.dumps(parsed_nodes, indent=2)}"
+        # Log debug information
+        log.debug("Translating %d nodes to %s: %s", len(parsed_nodes['texts']), target_language, parsed_nodes)
         
-        # Make the API call
+        # Make the API calls
         try:
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=0.3
+            translated_texts = asyncio.run(
+                translate_all_texts(parsed_nodes['texts'], target_language, api_key, model, placeholder)
             )
-            
-            # Print the raw response for debugging
-            print("\nOpenAI Response:")
-            print(response)
-            
-            # Extract and validate the response content
-            response_content = response.choices[0].message.content
-            if not response_content:
-                return None, "Empty response from OpenAI"
-                
-            # Try to parse the JSON response
-            try:
-                translated_json = json.loads(response_content)
-                return translated_json, None
-            except json.JSONDecodeError as e:
-                print(f"JSON Parse Error: {str(e)}")
-                print("Raw response content:")
-                print(response_content)
-                return None, f"Failed to parse OpenAI response as JSON: {str(e)}"
-                
+            # Zip the node IDs back on in the shape the DOM update endpoint expects
+            return {
+                "nodes": [
+                    {"nodeId": node_id, "text": text}
+                    for node_id, text in zip(parsed_nodes['ids'], translated_texts)
+                ]
+            }, None
+        except json.JSONDecodeError as e:
+            log.error("JSON Parse Error: %s", e)
+            return None, f"Failed to parse OpenAI response as JSON: {str(e)}"
         except Exception as e:
-            print(f"OpenAI API Error: {str(e)}")
+            log.error("OpenAI API Error: %s", e)
             return None, f"OpenAI API Error: {str(e)}"
             
     except Exception as e:
-        print(f"Unexpected Error: {str(e)}")
+        log.error("Unexpected Error: %s", e)
         return None, f"Translation error: {str(e)}"
 
-def update_component_content(site_id, component_id, locale_id, nodes, api_key):
+def update_component_content(site_id, component_id, locale_id, nodes, api_key, session=None):
     """Update component content with translated text"""
     # Updated URL structure to match the API specification
     url = f"https://api.webflow.com/v2/sites/{site_id}/components/{component_id}/dom?localeId={locale_id}"
     
-    headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}",
-        "content-type": "application/json"
-    }
+    session = session or get_webflow_session(api_key)
+    headers = {"content-type": "application/json"}
     
     payload = {
         "nodes": nodes
     }
     
-    print("\n" + "="*50)
-    print("UPDATE COMPONENT CONTENT REQUEST")
-    print("="*50)
-    print(f"URL: {url}")
-    print(f"Locale ID: {locale_id}")
-    print("\nHeaders:")
-    for key, value in headers.items():
-        if key.lower() == 'authorization':
-            print(f"{key}: Bearer ****{value[-4:]}")
-        else:
-            print(f"{key}: {value}")
-    print("\nPayload:")
-    print(json.dumps(payload, indent=2))
+    if DEBUG:
+        log.debug(
+            "Update component content - URL: %s, locale ID: %s, headers: %s, payload: %s",
+            url, locale_id, masked_headers({**session.headers, **headers}), payload
+        )
     
     try:
-        response = requests.post(url, headers=headers, json=payload)
-        print("\nResponse Status:", response.status_code)
-        print("Response Body:", response.text)
+        response = session.post(url, headers=headers, data=jdumps(payload).encode(), timeout=WEBFLOW_TIMEOUT)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Response status: %s, body: %s", response.status_code, response.text)
         response.raise_for_status()
-        return response.json(), None
+        return jloads(response.content), None
+    except requests.Timeout:
+        error_msg = f"Timed out updating component content after {WEBFLOW_TIMEOUT[1]}s"
+        log.error(error_msg)
+        return None, error_msg
     except Exception as e:
         error_msg = f"Error updating component content: {str(e)}"
-        print(f"\nERROR: {error_msg}")
+        log.error(error_msg)
         return None, error_msg
 
+def update_components_content(site_id, locale_id, updates, api_key):
+    """Update several components concurrently, returning {component_id: (result, error)}"""
+    # Resolve the shared session here, so the worker threads only do network I/O
+    session = get_webflow_session(api_key)
+    results = {}
+    with ThreadPoolExecutor(max_workers=min(8, len(updates))) as executor:
+        futures = {
+            executor.submit(
+                update_component_content, site_id, component_id, locale_id, nodes, api_key, session
+            ): component_id
+            for component_id, nodes in updates
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
+@st.fragment
+def component_section(options_to_id):
+    """Component selection and content viewer, rerun on their own when their widgets change"""
+    # Component selection
+    selected_component = st.selectbox(
+        "Select a component",
+        options=list(options_to_id),
+        key="component_selector"
+    )
+    
+    if selected_component:
+        component_id = options_to_id[selected_component]
+        st.session_state.selected_component_id = component_id
+        
+        # View content button
+        if st.button("View Component Content", key="view_component_button"):
+            with st.spinner("Fetching component content..."):
+                content = get_component_content(
+                    site_id=st.session_state.site_id,
+                    component_id=component_id,
+                    api_key=st.session_state.api_key
+                )
+                if content:
+                    st.session_state.current_component_content = content
+                    st.session_state.parsed_nodes = parse_component_content(content)
+                    # Rerun the whole app so the translation section picks up the new content
+                    st.rerun()
+        
+        # Display content if available
+        if st.session_state.current_component_content:
+            st.subheader("Raw Component Content")
+            st.json(st.session_state.current_component_content)
+            
+            # Display the simplified content
+            parsed_nodes = st.session_state.parsed_nodes
+            
+            if parsed_nodes['texts']:
+                st.subheader("Parsed Content")
+                st.json(parsed_nodes)
+            else:
+                st.info("No text content found in this component")
+
+@st.fragment
+def translation_section():
+    """Translate-and-update controls, rerun on their own when the button is clicked"""
+    st.subheader("Translate Content")
+    
+    # Create language selection with locale IDs
+    locale_options = build_locale_options(jdumps(st.session_state.locales, sort_keys=True))
+    
+    target_language = st.selectbox(
+        "Select target language",
+        options=list(locale_options.keys()),
+        key="translate_language_select"
+    )
+    
+    if st.button("Translate and Update Content", key="translate_update_button"):
+        with st.spinner(f"Translating to {target_language}..."):
+            # First translate the content, showing the model output while it streams in
+            stream_output = st.empty()
+            translated_content, error = translate_content_with_openai(
+                st.session_state.parsed_nodes,
+                locale_options[target_language]['tag'],
+                st.session_state.openai_key,
+                model=st.session_state.model,
+                placeholder=stream_output
+            )
+            stream_output.empty()
+            
+            if error:
+                st.error(error)
+            else:
+                st.subheader(f"Translated Content ({target_language})")
+                st.json(translated_content)
+                
+                # Then update the component with translated content
+                with st.spinner("Updating component content..."):
+                    updates = [
+                        # From the selected component
+                        (st.session_state.selected_component_id, translated_content['nodes'])
+                    ]
+                    results = update_components_content(
+                        site_id=st.session_state.site_id,
+                        locale_id=locale_options[target_language]['id'],
+                        updates=updates,
+                        api_key=st.session_state.api_key
+                    )
+                    
+                    for component_id, (result, error) in results.items():
+                        if error:
+                            st.error(f"{component_id}: {error}")
+                        else:
+                            st.success(f"Component {component_id} content updated successfully!")
+                            if result:
+                                st.json(result)
+
 def main():
     st.title("Static Elements Manager")
     
@@ -300,119 +658,33 @@ def main():
         st.subheader("Available Components")
         
         # Create a table of components
-        component_data = {
-            "Name": [comp.get('name', 'Unnamed') for comp in st.session_state.components],
-            "Component ID": [comp['id'] for comp in st.session_state.components],
-            "Type": [comp.get('type', 'Unknown') for comp in st.session_state.components]
-        }
-        st.table(component_data)
-        
-        # Component selection
-        selected_component = st.selectbox(
-            "Select a component",
-            options=[f"{comp.get('name', 'Unnamed')} ({comp['id']})" for comp in st.session_state.components],
-            key="component_selector"
+        components_table, options_to_id = component_views(
+            jdumps(st.session_state.components, sort_keys=True)
         )
+        st.dataframe(components_table, use_container_width=True, hide_index=True)
+        
+        component_section(options_to_id)
         
-        if selected_component:
-            component_id = selected_component.split('(')[-1].strip(')')
-            
-            # View content button
-            if st.button("View Component Content", key="view_component_button"):
-                with st.spinner("Fetching component content..."):
-                    content = get_component_content(
-                        site_id=st.session_state.site_id,
-                        component_id=component_id,
-                        api_key=st.session_state.api_key
-                    )
-                    if content:
-                        st.session_state.current_component_content = content
-            
-            # Display content if available
-            if st.session_state.current_component_content:
-                st.subheader("Raw Component Content")
-                st.json(st.session_state.current_component_content)
-                
-                # Parse and display the simplified content
-                parsed_nodes = parse_component_content(st.session_state.current_component_content)
-                st.session_state.parsed_nodes = parsed_nodes
-                
-                if parsed_nodes['nodes']:
-                    st.subheader("Parsed Content")
-                    st.json(parsed_nodes)
-                else:
-                    st.info("No text content found in this component")
-
         # After fetching components, add locale fetching
         if st.session_state.components:
-            # Fetch locales if not already in session state
-            if 'locales' not in st.session_state:
-                with st.spinner("Fetching site locales..."):
-                    locales = get_site_locales(st.session_state.site_id, st.session_state.api_key)
-                    if locales:
-                        st.session_state.locales = locales
-                        st.success(f"Successfully fetched {len(locales)} locales!")
+            # Locales are cached by get_site_locales, so reruns don't hit the API again
+            with st.spinner("Fetching site locales..."):
+                locales = get_site_locales(st.session_state.site_id, st.session_state.api_key)
+                if locales:
+                    st.session_state.locales = locales
             
             # Display locales if available
             if st.session_state.locales:
                 st.subheader("Available Locales")
-                locale_data = {
-                    "Name": [locale.get('displayName', 'Unnamed') for locale in st.session_state.locales],
-                    "Tag": [locale.get('tag', 'No tag') for locale in st.session_state.locales],
-                    "Type": [locale.get('type', 'Unknown') for locale in st.session_state.locales]
-                }
-                st.table(locale_data)
+                st.dataframe(
+                    locales_df(jdumps(st.session_state.locales, sort_keys=True)),
+                    use_container_width=True,
+                    hide_index=True
+                )
         
         # After parsing content, add translation section
         if st.session_state.parsed_nodes and st.session_state.openai_key and st.session_state.locales:
-            st.subheader("Translate Content")
-            
-            # Create language selection with locale IDs
-            locale_options = {
-                f"{locale.get('displayName', 'Unnamed')} ({locale.get('tag', 'No tag')})": {
-                    'tag': locale.get('tag', 'unknown'),
-                    'id': locale.get('id')
-                }
-                for locale in st.session_state.locales
-            }
-            
-            target_language = st.selectbox(
-                "Select target language",
-                options=list(locale_options.keys()),
-                key="translate_language_select"
-            )
-            
-            if st.button("Translate and Update Content", key="translate_update_button"):
-                with st.spinner(f"Translating to {target_language}..."):
-                    # First translate the content
-                    translated_content, error = translate_content_with_openai(
-                        st.session_state.parsed_nodes,
-                        locale_options[target_language]['tag'],
-                        st.session_state.openai_key
-                    )
-                    
-                    if error:
-                        st.error(error)
-                    else:
-                        st.subheader(f"Translated Content ({target_language})")
-                        st.json(translated_content)
-                        
-                        # Then update the component with translated content
-                        with st.spinner("Updating component content..."):
-                            result, error = update_component_content(
-                                site_id=st.session_state.site_id,
-                                component_id=component_id,  # From the selected component
-                                locale_id=locale_options[target_language]['id'],
-                                nodes=translated_content['nodes'],
-                                api_key=st.session_state.api_key
-                            )
-                            
-                            if error:
-                                st.error(error)
-                            else:
-                                st.success("Component content updated successfully!")
-                                if result:
-                                    st.json(result)
+            translation_section()
     else:
         st.info("No components fetched yet. Click 'Fetch Site Components' to begin.")
 
@@ -1,11 +1,40 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-import openai
+import orjson
+import logging
+import asyncio
+import hashlib
+import sqlite3
+import threading
 import time
-import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
-import zipfile
+
+# Log level comes from the LOG_LEVEL env var; full payload dumps are only built at DEBUG
+logging.basicConfig(
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "WARNING").upper())
+
+def jdumps(obj, indent=False):
+    """Serialize to a JSON string with orjson (optionally pretty-printed)"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+
+def jloads(data):
+    """Parse JSON from str or bytes with orjson"""
+    return orjson.loads(data)
+
+def masked_headers(headers):
+    """Return headers with the bearer token masked, for debug logging"""
+    return {
+        key: f"Bearer ****{value[-4:]}" if key.lower() == 'authorization' else value
+        for key, value in headers.items()
+    }
 
 # Hide the default menu
 st.set_page_config(
@@ -30,18 +59,12 @@ if 'parsed_nodes' not in st.session_state:
     st.session_state.parsed_nodes = None
 if 'selected_component' not in st.session_state:
     st.session_state.selected_component = None
-if 'translated_content' not in st.session_state:
-    st.session_state.translated_content = None
-if 'translation_requested' not in st.session_state:
-    st.session_state.translation_requested = False
-if 'target_language' not in st.session_state:
-    st.session_state.target_language = None
-if 'translation_started' not in st.session_state:
-    st.session_state.translation_started = False
 if 'selected_languages' not in st.session_state:
     st.session_state.selected_languages = []
-if 'translation_progress' not in st.session_state:
-    st.session_state.translation_progress = 0
+if 'model' not in st.session_state:
+    st.session_state.model = "gpt-4o-mini"
+if 'locales' not in st.session_state:
+    st.session_state.locales = []
 
 # Add sidebar configuration
 with st.sidebar:
@@ -70,226 +93,526 @@ with st.sidebar:
     )
     if openai_key:
         st.session_state.openai_key = openai_key
+    
+    st.session_state.model = st.selectbox(
+        "Model",
+        ["gpt-4o-mini", "gpt-4.1-mini", "gpt-4o"],
+        index=0,
+        help="OpenAI model used for translations; pick gpt-4o for quality-critical locales"
+    )
 
-def get_site_components(site_id, api_key):
-    """Get list of components from the site"""
-    url = f"https://api.webflow.com/v2/sites/{site_id}/components"
-    headers = {
+@st.cache_resource
+def get_webflow_session(api_key):
+    """Get a keep-alive session for the Webflow API, authenticated with the given key"""
+    session = requests.Session()
+    session.headers.update({
         "accept": "application/json",
         "authorization": f"Bearer {api_key}"
-    }
+    })
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        # Back off exponentially on rate limits and server errors, honoring Retry-After on 429s
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "POST"],
+            respect_retry_after_header=True,
+            raise_on_status=False  # Let raise_for_status() report the final response
+        )
+    )
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_site_components(site_id, api_key):
+    """Fetch the components of a site (cached, raises on failure)"""
+    url = f"https://api.webflow.com/v2/sites/{site_id}/components"
     
-    print(f"\n[DEBUG] Fetching components from URL: {url}")
+    logger.debug("Fetching components from URL: %s", url)
+    response = get_webflow_session(api_key).get(url)
+    response.raise_for_status()
+    return jloads(response.content)["components"]
+
+def get_site_components(site_id, api_key):
+    """Get list of components from the site"""
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        components = response.json()["components"]
-        print(f"[DEBUG] Successfully fetched {len(components)} components")
+        components = fetch_site_components(site_id, api_key)
+        logger.info("Successfully fetched %d components", len(components))
         return components
     except Exception as e:
-        print(f"[DEBUG] Error fetching components: {str(e)}")
+        logger.error("Error fetching components: %s", e)
         st.error(f"Error fetching components: {str(e)}")
         return []
 
-def get_component_content(site_id, component_id, api_key):
-    """Get component content using DOM endpoint"""
+def fetch_component_content(site_id, component_id, api_key, locale_id=None, session=None):
+    """Fetch the DOM of a component, optionally for a secondary locale (raises on failure)"""
     url = f"https://api.webflow.com/v2/sites/{site_id}/components/{component_id}/dom"
-    headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}",
-        "accept-version": "1.0.0"
-    }
+    session = session or get_webflow_session(api_key)
+    headers = {"accept-version": "1.0.0"}
+    params = {"localeId": locale_id} if locale_id else None
     
-    print("\n" + "="*50)
-    print("API REQUEST - Get Component Content")
-    print("="*50)
-    print(f"URL: {url}")
-    print("\nHeaders:")
-    for key, value in headers.items():
-        if key.lower() == 'authorization':
-            print(f"{key}: Bearer ****{value[-4:]}")
-        else:
-            print(f"{key}: {value}")
+    logger.info("Get component content request - URL: %s, locale ID: %s", url, locale_id)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Headers: %s", masked_headers({**session.headers, **headers}))
     
+    response = session.get(url, headers=headers, params=params)
+    response.raise_for_status()
+    data = jloads(response.content)
+    
+    # Log the complete API response; %r formatting is lazy, so nothing is serialized when disabled
+    logger.debug("Component content response: %r", data)
+    
+    return data
+
+def get_component_content(site_id, component_id, api_key, locale_id=None):
+    """Get component content using DOM endpoint"""
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Print the complete API response
-        print("\n" + "="*50)
-        print("COMPLETE API RESPONSE")
-        print("="*50)
-        print(json.dumps(data, indent=2))
-        
-        return data
+        return fetch_component_content(site_id, component_id, api_key, locale_id)
     except Exception as e:
-        print(f"\nERROR: {str(e)}")
+        logger.error("Error fetching component content: %s", e)
         st.error(f"Error fetching component content: {str(e)}")
         return None
 
+def iter_text_nodes(content):
+    """Yield node IDs and HTML for the nodes of a component that have non-empty html"""
+    return (
+        {"nodeId": node['id'], "text": html}  # Getting HTML instead of plain text
+        for node in content.get('nodes', ())
+        if (text := node.get('text')) and (html := text.get('html'))
+    )
+
 def parse_component_content(content):
     """Parse component content to extract node IDs and HTML"""
-    parsed_nodes = []
-    
-    for node in content.get('nodes', []):
-        # Only include nodes that have non-empty html
-        if node.get('text', {}).get('html'):
-            node_data = {
-                "nodeId": node['id'],
-                "text": node['text']['html']  # Getting HTML instead of plain text
-            }
-            parsed_nodes.append(node_data)
+    return {"nodes": list(iter_text_nodes(content))}
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_site_locales(site_id, api_key):
+    """Fetch the locales of a site (cached, raises on failure)"""
+    url = f"https://api.webflow.com/v2/sites/{site_id}"
+    
+    logger.debug("Fetching site locales from URL: %s", url)
+    response = get_webflow_session(api_key).get(url)
+    response.raise_for_status()
+    data = jloads(response.content)
     
-    return {"nodes": parsed_nodes}
+    locales = []
+    # Add primary locale
+    primary = data.get('locales', {}).get('primary', {})
+    if primary:
+        primary['type'] = 'Primary'
+        locales.append(primary)
+    
+    # Add secondary locales
+    secondary = data.get('locales', {}).get('secondary', [])
+    for locale in secondary:
+        locale['type'] = 'Secondary'
+        locales.append(locale)
+    
+    return locales
 
 def get_site_locales(site_id, api_key):
     """Get list of locales with their IDs"""
-    url = f"https://api.webflow.com/v2/sites/{site_id}"
-    headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}"
-    }
-    
-    print(f"\n[DEBUG] Fetching site locales from URL: {url}")
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        
-        locales = []
-        # Add primary locale
-        primary = data.get('locales', {}).get('primary', {})
-        if primary:
-            primary['type'] = 'Primary'
-            locales.append(primary)
-        
-        # Add secondary locales
-        secondary = data.get('locales', {}).get('secondary', [])
-        for locale in secondary:
-            locale['type'] = 'Secondary'
-            locales.append(locale)
-            
-        print(f"[DEBUG] Successfully fetched {len(locales)} locales")
+        locales = fetch_site_locales(site_id, api_key)
+        logger.info("Successfully fetched %d locales", len(locales))
         return locales
     except Exception as e:
-        print(f"[DEBUG] Error fetching locales: {str(e)}")
+        logger.error("Error fetching locales: %s", e)
         st.error(f"Error fetching site locales: {str(e)}")
         return []
 
-def translate_content_with_openai(parsed_nodes, target_language, api_key):
-    """Translate content using OpenAI while preserving JSON structure"""
+# On-disk cache of translated node HTML, kept for 7 days
+TRANSLATION_CACHE_PATH = ".static_elements_cache.sqlite3"
+TRANSLATION_CACHE_TTL = 86400 * 7
+
+class TranslationCache:
+    """SQLite-backed cache of translated node texts keyed on (model, target language, prompt version, text)"""
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, value TEXT NOT NULL, ts INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def key(text, target_language, model):
+        return hashlib.blake2b(f"{model}|{target_language}|{PROMPT_VERSION}|{text}".encode()).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM translations WHERE key = ? AND ts > ?",
+                (key, int(time.time()) - TRANSLATION_CACHE_TTL)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_many(self, items):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations (key, value, ts) VALUES (?, ?, ?)",
+                [(key, value, int(time.time())) for key, value in items]
+            )
+            self._conn.commit()
+
+@st.cache_resource
+def get_translation_cache():
+    """Get the process-wide translation cache"""
+    return TranslationCache(TRANSLATION_CACHE_PATH)
+
+def make_openai_client(api_key):
+    """Create an async OpenAI client, importing the SDK only once a translation actually runs"""
+    # openai pulls in httpx and pydantic, so keep it off the page's first-paint path
+    import openai
+    # The SDK retries rate limits, timeouts and server errors with jittered exponential backoff
+    return openai.AsyncOpenAI(api_key=api_key, max_retries=6)
+
+# Bump whenever SYSTEM_MESSAGE_TEMPLATE changes, so translations cached under the old prompt are not reused
+PROMPT_VERSION = 1
+
+# System message for translations; only the target language is filled in per call
+SYSTEM_MESSAGE_TEMPLATE = """You are a professional translator with 20 years of experience.  
+Translate each string in the given JSON array to {target_language}. 
+Follow these rules when translating:
+
+- When encountering the word "Deriv" and any succeeding word, analyze the context and based on it, keep it in English. For example, "Deriv Blog," "Deriv Life," "Deriv Bot," and "Deriv App" should be kept in English.
+- Keep product names such as P2P, MT5, Deriv X, Deriv cTrader, SmartTrader, Deriv Trader, Deriv GO, Deriv Bot, and Binary Bot in English.
+
+Return a JSON object {{"translations": [...]}} whose array has the same length and order."""
+
+async def translate_content_with_openai(parsed_nodes, target_language, client, model="gpt-4o-mini", placeholder=None):
+    """Translate content using OpenAI while preserving JSON structure.
+    
+    The response is streamed, and shown in the placeholder as it arrives when one is given."""
     try:
         # First verify we have valid inputs
         if not parsed_nodes:
             return None, "No content to translate"
         if not target_language:
             return None, "No target language specified"
-        if not api_key:
-            return None, "OpenAI API key is missing"
-            
-        client = openai.OpenAI(api_key=api_key)
         
-        # Print debug information
-        print("\n" + "="*50)
-        print("TRANSLATION REQUEST")
-        print("="*50)
-        print(f"Target Language: {target_language}")
-        print("Content to translate:")
-        print(json.dumps(parsed_nodes, indent=2))
+        # Log debug information
+        logger.debug("Translating %d nodes to %s: %r", len(parsed_nodes['nodes']), target_language, parsed_nodes)
         
         # Prepare the system message explaining what we want
-        system_message = f"""You are a professional translator with 20 years of experience.  
-        Translate only the "text" values in the JSON to {target_language}. 
-        Follow these rules when translating:
-
-        - When encountering the word "Deriv" and any succeeding word, analyze the context and based on it, keep it in English. For example, "Deriv Blog," "Deriv Life," "Deriv Bot," and "Deriv App" should be kept in English.
-        - Keep product names such as P2P, MT5, Deriv X, Deriv cTrader, SmartTrader, Deriv Trader, Deriv GO, Deriv Bot, and Binary Bot in English.
+        system_message = SYSTEM_MESSAGE_TEMPLATE.format(target_language=target_language)
         
-        Keep all other JSON structure and values exactly the same.
-        Return only the JSON, no explanations."""
-        
-        # Prepare the JSON for translation
-        user_message = f"Translate this JSON content. Original JSON:\n{json.dumps(parsed_nodes, indent=2)}"
+        # Send each distinct text once as a compact array; node IDs are mapped back on locally
+        texts = list(dict.fromkeys(node['text'] for node in parsed_nodes['nodes']))
+        logger.debug("Sending %d unique texts for %d nodes", len(texts), len(parsed_nodes['nodes']))
+        user_message = jdumps(texts)
         
         # Make the API call
         try:
-            response = client.chat.completions.create(
-                model="gpt-4",
+            stream = await client.chat.completions.create(
+                model=model,
                 messages=[
                     {"role": "system", "content": system_message},
                     {"role": "user", "content": user_message}
                 ],
-                temperature=0.3
+                temperature=0.3,
+                response_format={"type": "json_object"},
+                stream=True
             )
             
-            # Print the raw response for debugging
-            print("\nOpenAI Response:")
-            print(response)
+            response_content = ""
+            finish_reason = None
+            last_render = 0.0
+            async for chunk in stream:
+                if chunk.choices:
+                    response_content += chunk.choices[0].delta.content or ""
+                    finish_reason = chunk.choices[0].finish_reason or finish_reason
+                
+                # Refresh the partial output at most every 200ms
+                if placeholder is not None and time.monotonic() - last_render >= 0.2:
+                    placeholder.code(response_content, language="json")
+                    last_render = time.monotonic()
+            
+            if placeholder is not None:
+                placeholder.code(response_content, language="json")
+            
+            # Log the raw response for debugging
+            logger.debug("OpenAI Response: %s", response_content)
             
             # Extract and validate the response content
-            response_content = response.choices[0].message.content
             if not response_content:
                 return None, "Empty response from OpenAI"
+            if finish_reason == "length":
+                return None, "OpenAI response was cut off before the JSON was complete"
                 
             # Try to parse the JSON response
             try:
-                translated_json = json.loads(response_content)
-                return translated_json, None
+                translated_texts = jloads(response_content).get("translations")
+                if not isinstance(translated_texts, list) or len(translated_texts) != len(texts):
+                    return None, f"Expected a JSON array of {len(texts)} strings from OpenAI"
+                translations = dict(zip(texts, translated_texts))
+                return {
+                    "nodes": [
+                        {"nodeId": node['nodeId'], "text": translations[node['text']]}
+                        for node in parsed_nodes['nodes']
+                    ]
+                }, None
             except json.JSONDecodeError as e:
-                print(f"JSON Parse Error: {str(e)}")
-                print("Raw response content:")
-                print(response_content)
+                logger.error("JSON Parse Error: %s", e)
+                logger.debug("Raw response content: %s", response_content)
                 return None, f"Failed to parse OpenAI response as JSON: {str(e)}"
                 
         except Exception as e:
-            print(f"OpenAI API Error: {str(e)}")
+            logger.error("OpenAI API Error: %s", e)
             return None, f"OpenAI API Error: {str(e)}"
             
     except Exception as e:
-        print(f"Unexpected Error: {str(e)}")
+        logger.error("Unexpected Error: %s", e)
         return None, f"Translation error: {str(e)}"
 
-def update_component_content(site_id, component_id, locale_id, nodes, api_key):
+# Large components are split into chunks of at most this many input tokens, translated concurrently
+MAX_TOKENS_PER_REQUEST = 2000
+
+# Cap on in-flight OpenAI requests when a batch fans out over languages and chunks
+MAX_CONCURRENT_REQUESTS = 5
+
+def estimate_tokens(text):
+    """Roughly estimate the token count of a string (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+def chunk_nodes(nodes):
+    """Greedily pack nodes, in order, into chunks of at most MAX_TOKENS_PER_REQUEST estimated tokens"""
+    chunk, chunk_tokens = [], 0
+    for node in nodes:
+        tokens = estimate_tokens(node['text'])
+        if chunk and chunk_tokens + tokens > MAX_TOKENS_PER_REQUEST:
+            yield chunk
+            chunk, chunk_tokens = [], 0
+        chunk.append(node)
+        chunk_tokens += tokens
+    if chunk:
+        yield chunk
+
+async def translate_nodes_chunked(parsed_nodes, target_language, client, model="gpt-4o-mini", placeholder=None, semaphore=None):
+    """Translate parsed nodes in token-bounded chunks concurrently, returning them in the original order.
+    
+    When a semaphore is given, every chunk request holds it while it runs."""
+    async def translate_chunk(chunk, slot):
+        if semaphore is None:
+            return await translate_content_with_openai(chunk, target_language, client, model, slot)
+        async with semaphore:
+            return await translate_content_with_openai(chunk, target_language, client, model, slot)
+    
+    chunks = list(chunk_nodes(parsed_nodes['nodes']))
+    if len(chunks) <= 1:
+        return await translate_chunk(parsed_nodes, placeholder)
+    
+    logger.info("Splitting %d nodes for %s into %d chunks", len(parsed_nodes['nodes']), target_language, len(chunks))
+    # Give every chunk its own slot so concurrent streams don't overwrite each other
+    slots = [None] * len(chunks)
+    if placeholder is not None:
+        container = placeholder.container()
+        slots = [container.empty() for _ in chunks]
+    
+    results = await asyncio.gather(*(
+        translate_chunk({"nodes": chunk}, slot) for chunk, slot in zip(chunks, slots)
+    ))
+    nodes = []
+    for translated, error in results:
+        if error:
+            return None, error
+        nodes.extend(translated['nodes'])
+    return {"nodes": nodes}, None
+
+async def translate_nodes_cached(parsed_nodes, target_language, client, model="gpt-4o-mini", placeholder=None, semaphore=None):
+    """Translate parsed nodes, serving cached texts and sending only the misses to OpenAI"""
+    cache = get_translation_cache()
+    nodes = parsed_nodes['nodes']
+    keys = [cache.key(node['text'], target_language, model) for node in nodes]
+    cached = [cache.get(key) for key in keys]
+    misses = [i for i, text in enumerate(cached) if text is None]
+    logger.info("Translation cache for %s: %d hits, %d misses", target_language, len(nodes) - len(misses), len(misses))
+    
+    if misses:
+        translated, error = await translate_nodes_chunked(
+            {"nodes": [nodes[i] for i in misses]}, target_language, client, model, placeholder, semaphore
+        )
+        if error:
+            return None, error
+        translated_nodes = translated.get('nodes', [])
+        if len(translated_nodes) != len(misses):
+            return None, f"Expected {len(misses)} translated nodes, got {len(translated_nodes)}"
+        for i, node in zip(misses, translated_nodes):
+            cached[i] = node['text']
+        cache.set_many((keys[i], cached[i]) for i in misses)
+    
+    return {"nodes": [{"nodeId": node['nodeId'], "text": text} for node, text in zip(nodes, cached)]}, None
+
+async def translate_to_languages(parsed_nodes, languages, locale_options, api_key, model, progress_bar=None, placeholder=None, pending_nodes=None):
+    """Translate the nodes to all languages concurrently, returning {language: (translated, error)}.
+    
+    When a placeholder is given, each language's model output is shown in it while it streams in.
+    pending_nodes can map a language to the subset of nodes it still needs; others get all nodes."""
+    # Give every language its own slot so concurrent streams don't overwrite each other
+    slots = dict.fromkeys(languages)
+    if placeholder is not None:
+        container = placeholder.container()
+        slots = {language: container.empty() for language in languages}
+    
+    # One semaphore across every language and chunk, so large components stay under the rate limit
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    async with make_openai_client(api_key) as client:
+        async def translate(language):
+            nodes = (pending_nodes or {}).get(language, parsed_nodes)
+            if not nodes['nodes']:
+                return language, ({"nodes": []}, None)
+            return language, await translate_nodes_cached(
+                nodes, locale_options[language]['tag'], client, model,
+                placeholder=slots[language], semaphore=semaphore
+            )
+        
+        # Bump the progress bar as each language finishes, in whatever order they complete
+        results = {}
+        for future in asyncio.as_completed([translate(language) for language in languages]):
+            language, result = await future
+            results[language] = result
+            if progress_bar is not None:
+                progress_bar.progress(len(results) / len(languages), text=f"Translated {language}")
+    return results
+
+async def translate_components_batch(components_nodes, target_language, client, model="gpt-4o-mini", semaphore=None):
+    """Translate several components' nodes together, returning ({component_id: translated}, error)"""
+    # Concatenate every component's nodes into one cached request and split the result back by length
+    all_nodes = [node for parsed in components_nodes.values() for node in parsed['nodes']]
+    translated, error = await translate_nodes_cached(
+        {"nodes": all_nodes}, target_language, client, model, semaphore=semaphore
+    )
+    if error:
+        return None, error
+    
+    results, offset = {}, 0
+    for component_id, parsed in components_nodes.items():
+        count = len(parsed['nodes'])
+        results[component_id] = {"nodes": translated['nodes'][offset:offset + count]}
+        offset += count
+    return results, None
+
+async def translate_components_to_languages(components_nodes, languages, locale_options, api_key, model):
+    """Translate a batch of components to all languages concurrently, serving cached texts"""
+    # One semaphore across every language and chunk, so large selections stay under the rate limit
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    async with make_openai_client(api_key) as client:
+        results = await asyncio.gather(*(
+            translate_components_batch(components_nodes, locale_options[language]['tag'], client, model, semaphore)
+            for language in languages
+        ))
+    return dict(zip(languages, results))
+
+def update_component_content(site_id, component_id, locale_id, nodes, api_key, session=None):
     """Update component content with translated text"""
     # Updated URL structure to match the API specification
     url = f"https://api.webflow.com/v2/sites/{site_id}/components/{component_id}/dom?localeId={locale_id}"
     
-    headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}",
-        "content-type": "application/json"
-    }
+    session = session or get_webflow_session(api_key)
+    headers = {"content-type": "application/json"}
     
     payload = {
         "nodes": nodes
     }
     
-    print("\n" + "="*50)
-    print("UPDATE COMPONENT CONTENT REQUEST")
-    print("="*50)
-    print(f"URL: {url}")
-    print(f"Locale ID: {locale_id}")
-    print("\nHeaders:")
-    for key, value in headers.items():
-        if key.lower() == 'authorization':
-            print(f"{key}: Bearer ****{value[-4:]}")
-        else:
-            print(f"{key}: {value}")
-    print("\nPayload:")
-    print(json.dumps(payload, indent=2))
+    logger.info("Update component content request - URL: %s, locale ID: %s", url, locale_id)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Headers: %s", masked_headers({**session.headers, **headers}))
+        logger.debug("Payload:\n%s", jdumps(payload, indent=True))
     
     try:
-        response = requests.post(url, headers=headers, json=payload)
-        print("\nResponse Status:", response.status_code)
-        print("Response Body:", response.text)
+        response = session.post(url, headers=headers, data=orjson.dumps(payload))
+        logger.info("API response status code: %s", response.status_code)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response Body: %s", response.text)
         response.raise_for_status()
-        return response.json(), None
+        return jloads(response.content), None
     except Exception as e:
         error_msg = f"Error updating component content: {str(e)}"
-        print(f"\nERROR: {error_msg}")
+        logger.error(error_msg)
         return None, error_msg
 
+def untranslated_nodes(site_id, component_id, parsed_nodes, locale_ids, api_key):
+    """Return {label: parsed nodes} of the primary nodes each locale hasn't translated yet, and errors.
+    
+    A node counts as translated when the locale's text is non-empty and differs from the primary's."""
+    # Resolve the shared session here, so the worker threads only do network I/O
+    session = get_webflow_session(api_key)
+    pending, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=min(8, len(locale_ids))) as executor:
+        futures = {
+            executor.submit(fetch_component_content, site_id, component_id, api_key, locale_id, session): label
+            for label, locale_id in locale_ids.items()
+        }
+        for future in as_completed(futures):
+            label = futures[future]
+            try:
+                localized = {node['nodeId']: node['text'] for node in iter_text_nodes(future.result())}
+            except Exception as e:
+                errors[label] = str(e)
+                continue
+            pending[label] = {
+                "nodes": [
+                    node for node in parsed_nodes['nodes']
+                    if not localized.get(node['nodeId']) or localized[node['nodeId']] == node['text']
+                ]
+            }
+    return pending, errors
+
+def session_views(name, source, build):
+    """Build derived views of a session list once, rebuilding only when the list's id() or length changes"""
+    stamp = (id(source), len(source))
+    cached = st.session_state.get(name)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, build(source))
+        st.session_state[name] = cached
+    return cached[1]
+
+def build_locale_views(locales):
+    """Build the locales table and the language options with both tag and ID in one pass"""
+    locale_data = {"Name": [], "Tag": [], "Type": []}
+    locale_options = {}
+    for locale in locales:
+        name = locale.get('displayName', 'Unnamed')
+        tag = locale.get('tag', 'No tag')
+        locale_data["Name"].append(name)
+        locale_data["Tag"].append(tag)
+        locale_data["Type"].append(locale.get('type', 'Unknown'))
+        locale_options[f"{name} ({tag})"] = {
+            'tag': locale.get('tag', 'unknown'),
+            'id': locale.get('id')
+        }
+    return locale_data, locale_options
+
+def build_component_views(components):
+    """Build the components table and an ID-to-label map for the selectors in one pass"""
+    component_data = {"Name": [], "Component ID": [], "Type": []}
+    labels = {}
+    for comp in components:
+        name = comp.get('name', 'Unnamed')
+        component_data["Name"].append(name)
+        component_data["Component ID"].append(comp['id'])
+        component_data["Type"].append(comp.get('type', 'Unknown'))
+        labels[comp['id']] = f"{name} ({comp['id']})"
+    return component_data, labels
+
+def update_contents_concurrently(site_id, updates, api_key):
+    """POST (label, component_id, locale_id, nodes) updates concurrently, yielding (label, result, error) as each completes"""
+    # Resolve the shared session here, so the worker threads only do network I/O
+    session = get_webflow_session(api_key)
+    with ThreadPoolExecutor(max_workers=min(8, len(updates))) as executor:
+        futures = {
+            executor.submit(
+                update_component_content, site_id, component_id, locale_id, nodes, api_key, session
+            ): label
+            for label, component_id, locale_id, nodes in updates
+        }
+        for future in as_completed(futures):
+            result, error = future.result()
+            yield futures[future], result, error
+
 def main():
     st.title("Static Elements Manager")
     
@@ -319,20 +642,23 @@ def main():
         st.stop()
     
     # 2. Fetch and Display Locales
-    if 'locales' not in st.session_state:
-        with st.spinner("Fetching site locales..."):
-            locales = get_site_locales(st.session_state.site_id, st.session_state.api_key)
-            if locales:
-                st.session_state.locales = locales
-                st.success(f"Successfully fetched {len(locales)} locales!")
+    # Components and locales are cached for 5 minutes; the refresh button drops the cached copies
+    if st.button("Refresh Webflow Data", key="refresh_webflow_data"):
+        fetch_site_components.clear()
+        fetch_site_locales.clear()
+    
+    # Locales are cached by get_site_locales, so reruns don't hit the API again
+    with st.spinner("Fetching site locales..."):
+        locales = get_site_locales(st.session_state.site_id, st.session_state.api_key)
+        # Keep the stored list object unless the locales changed, so derived views stay cached
+        if locales and locales != st.session_state.locales:
+            st.session_state.locales = locales
     
     if st.session_state.get('locales'):
+        locale_data, locale_options = session_views(
+            'locale_views_cached', st.session_state.locales, build_locale_views
+        )
         st.subheader("Available Locales")
-        locale_data = {
-            "Name": [locale.get('displayName', 'Unnamed') for locale in st.session_state.locales],
-            "Tag": [locale.get('tag', 'No tag') for locale in st.session_state.locales],
-            "Type": [locale.get('type', 'Unknown') for locale in st.session_state.locales]
-        }
         st.table(locale_data)
     
     # 3. Fetch Components
@@ -348,34 +674,30 @@ def main():
         st.subheader("Available Components")
         
         # Create a table of components
-        component_data = {
-            "Name": [comp.get('name', 'Unnamed') for comp in st.session_state.components],
-            "Component ID": [comp['id'] for comp in st.session_state.components],
-            "Type": [comp.get('type', 'Unknown') for comp in st.session_state.components]
-        }
+        component_data, component_labels = session_views(
+            'component_views_cached', st.session_state.components, build_component_views
+        )
         st.table(component_data)
         
         # 5. Component Selection and Content View
+        # Options are the component IDs themselves; the labels are only used for display
         selected_component = st.selectbox(
             "Select a component",
-            options=[f"{comp.get('name', 'Unnamed')} ({comp['id']})" for comp in st.session_state.components],
+            options=component_data["Component ID"],
+            format_func=component_labels.get,
             key="component_selector",
             index=0 if st.session_state.selected_component else 0
         )
         
         if selected_component:
             st.session_state.selected_component = selected_component
-            component_id = selected_component.split('(')[-1].strip(')')
+            component_id = selected_component
             
             # Initialize component content state if not present
             if 'current_component_content' not in st.session_state:
                 st.session_state.current_component_content = None
             if 'parsed_nodes' not in st.session_state:
                 st.session_state.parsed_nodes = None
-            if 'translation_in_progress' not in st.session_state:
-                st.session_state.translation_in_progress = False
-            if 'current_translation_index' not in st.session_state:
-                st.session_state.current_translation_index = 0
             if 'selected_languages' not in st.session_state:
                 st.session_state.selected_languages = []
             
@@ -407,91 +729,106 @@ def main():
                     if st.session_state.openai_key and st.session_state.locales:
                         st.subheader("Translate Content")
                         
-                        # Create language selection with both tag and ID
-                        locale_options = {
-                            f"{locale.get('displayName', 'Unnamed')} ({locale.get('tag', 'No tag')})": {
-                                'tag': locale.get('tag', 'unknown'),
-                                'id': locale.get('id')
-                            }
-                            for locale in st.session_state.locales
-                        }
+                        # Language selection with both tag and ID comes from the cached locale views
                         
                         # Multi-select for languages
-                        if not st.session_state.translation_in_progress:
-                            selected_languages = st.multiselect(
-                                "Select target languages",
-                                options=list(locale_options.keys()),
-                                key="translate_languages_select",
-                                default=st.session_state.selected_languages
-                            )
-                            
-                            # Store selected languages in session state
-                            if selected_languages != st.session_state.selected_languages:
-                                st.session_state.selected_languages = selected_languages
-                                
-                            # Start translation button
-                            if st.button("Start Translation", key="start_translation"):
-                                if not st.session_state.selected_languages:
-                                    st.warning("Please select at least one language")
-                                else:
-                                    st.session_state.translation_in_progress = True
-                                    st.session_state.current_translation_index = 0
-                                    st.rerun()
+                        selected_languages = st.multiselect(
+                            "Select target languages",
+                            options=list(locale_options.keys()),
+                            key="translate_languages_select",
+                            default=st.session_state.selected_languages
+                        )
                         
-                        # Handle ongoing translation
-                        if st.session_state.translation_in_progress:
-                            progress_bar = st.progress(st.session_state.current_translation_index / len(st.session_state.selected_languages))
-                            current_language = st.session_state.selected_languages[st.session_state.current_translation_index]
-                            
-                            st.write(f"Translating {current_language} ({st.session_state.current_translation_index + 1}/{len(st.session_state.selected_languages)})")
-                            
-                            # Perform translation for current language
-                            translated_content, error = translate_content_with_openai(
-                                st.session_state.parsed_nodes,
-                                locale_options[current_language]['tag'],
-                                st.session_state.openai_key
-                            )
-                            
-                            if error:
-                                st.error(f"Error translating to {current_language}: {error}")
-                                st.session_state.translation_in_progress = False
+                        # Store selected languages in session state
+                        if selected_languages != st.session_state.selected_languages:
+                            st.session_state.selected_languages = selected_languages
+                        
+                        skip_translated = st.checkbox(
+                            "Skip nodes already translated in the target locale",
+                            value=True,
+                            key="skip_translated_nodes",
+                            help="Only send nodes whose locale text is empty or still matches the primary locale"
+                        )
+                        
+                        # Start translation button; the whole job runs in this script run
+                        if st.button("Start Translation", key="start_translation"):
+                            if not st.session_state.selected_languages:
+                                st.warning("Please select at least one language")
                             else:
-                                # Get the locale ID for the API call
-                                locale_id = locale_options[current_language]['id']
-                                
-                                # Create an expander for translation details
-                                with st.expander(f"Translation Details - {current_language}", expanded=True):
-                                    st.subheader("Translated Content")
-                                    st.json(translated_content)
+                                languages = st.session_state.selected_languages
+                                failed = False
+                                with st.status(f"Translating {len(languages)} languages...", expanded=True) as status:
+                                    # Find the nodes each locale still needs, so already-translated ones aren't resent
+                                    pending_nodes = None
+                                    if skip_translated:
+                                        status.update(label="Checking existing translations...")
+                                        pending_nodes, fetch_errors = untranslated_nodes(
+                                            st.session_state.site_id,
+                                            component_id,
+                                            st.session_state.parsed_nodes,
+                                            {language: locale_options[language]['id'] for language in languages},
+                                            st.session_state.api_key
+                                        )
+                                        for language, error in fetch_errors.items():
+                                            st.warning(f"Couldn't check existing {language} content, translating all nodes: {error}")
                                     
-                                    # Update the component content
-                                    result, error = update_component_content(
-                                        site_id=st.session_state.site_id,
-                                        component_id=component_id,
-                                        locale_id=locale_id,
-                                        nodes=translated_content['nodes'],
-                                        api_key=st.session_state.api_key
-                                    )
+                                    status.update(label=f"Translating {len(languages)} languages...")
+                                    progress_bar = st.progress(0.0)
+                                    stream_output = st.empty()
                                     
-                                    if error:
-                                        st.error(f"Failed to update content for {current_language}: {error}")
-                                        st.session_state.translation_in_progress = False
-                                    else:
-                                        st.success(f"Successfully updated content for {current_language}")
+                                    # Translate all selected languages at once
+                                    results = asyncio.run(translate_to_languages(
+                                        st.session_state.parsed_nodes,
+                                        languages,
+                                        locale_options,
+                                        st.session_state.openai_key,
+                                        st.session_state.model,
+                                        progress_bar,
+                                        stream_output,
+                                        pending_nodes
+                                    ))
+                                    stream_output.empty()
+                                    
+                                    updates = []
+                                    for current_language in languages:
+                                        translated_content, error = results[current_language]
+                                        if error:
+                                            st.error(f"Error translating to {current_language}: {error}")
+                                            failed = True
+                                            continue
+                                        if not translated_content['nodes']:
+                                            st.info(f"{current_language} is already fully translated")
+                                            continue
                                         
-                                        # Move to next language or finish
-                                        st.session_state.current_translation_index += 1
-                                        if st.session_state.current_translation_index >= len(st.session_state.selected_languages):
-                                            st.session_state.translation_in_progress = False
-                                            st.success("All translations completed!")
-                                            if st.button("Start New Translation"):
-                                                st.session_state.translation_in_progress = False
-                                                st.session_state.current_translation_index = 0
-                                                st.session_state.selected_languages = []
-                                                st.rerun()
-                                        else:
-                                            time.sleep(1)  # Small delay between translations
-                                            st.rerun()
+                                        # Create an expander for translation details
+                                        with st.expander(f"Translation Details - {current_language}"):
+                                            st.json(translated_content)
+                                        
+                                        # Queue the update with the locale ID for the API call
+                                        updates.append((
+                                            current_language,
+                                            component_id,
+                                            locale_options[current_language]['id'],
+                                            translated_content['nodes']
+                                        ))
+                                    
+                                    # Push all locales to Webflow concurrently
+                                    if updates:
+                                        status.update(label=f"Updating {len(updates)} locales...")
+                                        for i, (current_language, result, error) in enumerate(update_contents_concurrently(
+                                            st.session_state.site_id, updates, st.session_state.api_key
+                                        ), 1):
+                                            status.update(label=f"Updated {current_language} ({i}/{len(updates)})")
+                                            if error:
+                                                st.error(f"Failed to update content for {current_language}: {error}")
+                                                failed = True
+                                            else:
+                                                st.success(f"Successfully updated content for {current_language}")
+                                    
+                                    if failed:
+                                        status.update(label="Translation finished with errors", state="error")
+                                    else:
+                                        status.update(label="All translations completed!", state="complete")
                     else:
                         if not st.session_state.openai_key:
                             st.warning("Please add your OpenAI API key in the sidebar to enable translations")
@@ -499,6 +836,80 @@ def main():
                             st.warning("No locales available for translation")
                 else:
                     st.info("No text content found in this component")
+        
+        # 7. Batch translation across several components, one OpenAI call per language
+        if st.session_state.openai_key and st.session_state.get('locales'):
+            st.subheader("Batch Translate Components")
+            
+            batch_components = st.multiselect(
+                "Select components",
+                options=component_data["Component ID"],
+                format_func=component_labels.get,
+                key="batch_components_select"
+            )
+            batch_languages = st.multiselect(
+                "Select target languages",
+                options=list(locale_options.keys()),
+                key="batch_languages_select"
+            )
+            
+            if st.button("Translate Selected Components", key="batch_translate_button"):
+                if not batch_components or not batch_languages:
+                    st.warning("Please select at least one component and one language")
+                else:
+                    # Collect the parsed nodes of every selected component that has text
+                    components_nodes = {}
+                    with st.spinner("Fetching component content..."):
+                        for batch_component_id in batch_components:
+                            content = get_component_content(
+                                site_id=st.session_state.site_id,
+                                component_id=batch_component_id,
+                                api_key=st.session_state.api_key
+                            )
+                            if content:
+                                parsed = parse_component_content(content)
+                                if parsed['nodes']:
+                                    components_nodes[batch_component_id] = parsed
+                    
+                    if not components_nodes:
+                        st.info("No text content found in the selected components")
+                    else:
+                        with st.spinner(f"Translating {len(components_nodes)} components..."):
+                            results = asyncio.run(translate_components_to_languages(
+                                components_nodes,
+                                batch_languages,
+                                locale_options,
+                                st.session_state.openai_key,
+                                st.session_state.model
+                            ))
+                        
+                        updates = []
+                        for language in batch_languages:
+                            translated_components, error = results[language]
+                            if error:
+                                st.error(f"Error translating to {language}: {error}")
+                                continue
+                            
+                            updates.extend(
+                                (
+                                    f"{batch_component_id} for {language}",
+                                    batch_component_id,
+                                    locale_options[language]['id'],
+                                    translated_content['nodes']
+                                )
+                                for batch_component_id, translated_content in translated_components.items()
+                            )
+                        
+                        # Push every component and locale pair to Webflow concurrently
+                        if updates:
+                            with st.spinner(f"Applying {len(updates)} updates..."):
+                                for label, result, error in update_contents_concurrently(
+                                    st.session_state.site_id, updates, st.session_state.api_key
+                                ):
+                                    if error:
+                                        st.error(f"Failed to update {label}: {error}")
+                                    else:
+                                        st.success(f"Successfully updated {label}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
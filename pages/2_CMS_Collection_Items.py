@@ -1,16 +1,35 @@
 import streamlit as st
 import requests
-import json
-import openai
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+import asyncio
+import re
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+import importlib.util
 import logging
+import os
 
-# Set up logging configuration at the top of the file
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
-logger = logging.getLogger(__name__)
+# Set up logging configuration at the top of the file, unless another page already did
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+logger = logging.getLogger("cms_collection_items")
+
+def jdumps(obj):
+    """Serialize to a compact JSON string with orjson"""
+    return orjson.dumps(obj).decode()
+
+def jloads(data):
+    """Parse JSON from str or bytes with orjson"""
+    return orjson.loads(data)
 
 # Hide the default menu
 st.set_page_config(
@@ -52,89 +71,115 @@ def get_collection_config(collection_name):
     return None, None
 
 def parse_collection_items(items, collection_type, config):
-    """Parse collection items based on collection type"""
+    """Parse collection items based on collection type, reading only the fields the selector shows"""
     parsed_items = []
     
     for item in items:
         field_data = item.get('fieldData', {})
         
-        # Get identifier for display
-        identifier = field_data.get(config['item_identifier'], 'Unnamed')
-        
-        # Create filtered data dictionary
-        filtered_data = {
-            key: field_data.get(key, '')
-            for key in config['fields_to_translate'] + config['fields_to_preserve']
-            if key in field_data
-        }
-        
         parsed_items.append({
             'id': item.get('id'),
-            'identifier': identifier,
+            # Get identifier for display
+            'identifier': field_data.get(config['item_identifier'], 'Unnamed'),
             'slug': field_data.get('slug', 'no-slug'),
-            'data': filtered_data
+            'field_data': field_data
         })
     
     return parsed_items
 
-def get_cms_locales(site_id, api_key):
-    """Get list of CMS locales from site data"""
-    url = f"https://api.webflow.com/v2/sites/{site_id}"
-    headers = {
+def filter_field_data(field_data, config):
+    """Create the filtered data dictionary of the fields to translate and preserve"""
+    return {
+        key: field_data.get(key, '')
+        for key in config['fields_to_translate'] + config['fields_to_preserve']
+        if key in field_data
+    }
+
+@st.cache_resource
+def get_webflow_session(api_key):
+    """Get a keep-alive session for the Webflow API, authenticated with the given key"""
+    session = requests.Session()
+    session.headers.update({
         "accept": "application/json",
         "authorization": f"Bearer {api_key}"
-    }
+    })
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False  # Let raise_for_status() report the final response
+        )
+    )
+    session.mount("https://", adapter)
+    return session
+
+def api_key_digest(api_key):
+    """Short digest of an API key so the raw secret is never used as a cache key"""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_cms_locales(site_id, api_key_hash, _api_key):
+    """Fetch the list of CMS locales from site data (cached, raises on failure)"""
+    url = f"https://api.webflow.com/v2/sites/{site_id}"
     
-    try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        
-        cms_locales = []
-        
-        # Add primary locale
-        primary = data.get('locales', {}).get('primary', {})
-        if primary:
+    response = get_webflow_session(_api_key).get(url)
+    response.raise_for_status()
+    data = jloads(response.content)
+    
+    cms_locales = []
+    
+    # Add primary locale
+    primary = data.get('locales', {}).get('primary', {})
+    if primary:
+        cms_locales.append({
+            'name': primary.get('displayName', 'Unnamed'),
+            'id': primary.get('cmsLocaleId'),
+            'code': primary.get('tag'),
+            'default': True
+        })
+    
+    # Add secondary locales
+    secondary = data.get('locales', {}).get('secondary', [])
+    for locale in secondary:
+        if locale.get('enabled', False):  # Only include enabled locales
             cms_locales.append({
-                'name': primary.get('displayName', 'Unnamed'),
-                'id': primary.get('cmsLocaleId'),
-                'code': primary.get('tag'),
-                'default': True
+                'name': locale.get('displayName', 'Unnamed'),
+                'id': locale.get('cmsLocaleId'),
+                'code': locale.get('tag'),
+                'default': False
             })
-        
-        # Add secondary locales
-        secondary = data.get('locales', {}).get('secondary', [])
-        for locale in secondary:
-            if locale.get('enabled', False):  # Only include enabled locales
-                cms_locales.append({
-                    'name': locale.get('displayName', 'Unnamed'),
-                    'id': locale.get('cmsLocaleId'),
-                    'code': locale.get('tag'),
-                    'default': False
-                })
-        
-        return cms_locales
+    
+    return cms_locales
+
+def get_cms_locales(site_id, api_key):
+    """Get list of CMS locales from site data"""
+    try:
+        return fetch_cms_locales(site_id, api_key_digest(api_key), _api_key=api_key)
     except Exception as e:
         st.error(f"Error fetching CMS locales: {str(e)}")
         return []
 
-def get_collection_items(site_id, collection_id, api_key, offset=0, limit=100):
-    """Get collection items with optional filtering"""
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_collection_items(site_id, collection_id, api_key_hash, _api_key, offset=0, limit=100):
+    """Fetch a page of collection items (cached, raises on failure)"""
     url = f"https://api.webflow.com/v2/collections/{collection_id}/items"
-    headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}"
-    }
     
     params = {
         "offset": offset,
         "limit": limit
     }
     
+    response = get_webflow_session(_api_key).get(url, params=params)
+    response.raise_for_status()
+    return jloads(response.content)
+
+def get_collection_items(site_id, collection_id, api_key, offset=0, limit=100):
+    """Get collection items with optional filtering"""
     try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        return response.json()
+        return fetch_collection_items(site_id, collection_id, api_key_digest(api_key), api_key, offset, limit)
     except Exception as e:
         st.error(f"Error fetching collection items: {str(e)}")
         return None
@@ -142,10 +187,6 @@ def get_collection_items(site_id, collection_id, api_key, offset=0, limit=100):
 def translate_collection_item(collection_id, item_id, api_key, cms_locale_id):
     """Get translated version of a collection item"""
     url = f"https://api.webflow.com/v2/collections/{collection_id}/items/{item_id}"
-    headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}"
-    }
     
     # Add the CMS Locale ID as a query parameter
     params = {
@@ -153,20 +194,16 @@ def translate_collection_item(collection_id, item_id, api_key, cms_locale_id):
     }
     
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = get_webflow_session(api_key).get(url, params=params)
         response.raise_for_status()
-        return response.json(), None
+        return jloads(response.content), None
     except Exception as e:
         return None, f"Error fetching translation: {str(e)}"
 
 def update_collection_item(collection_id, item_id, api_key, cms_locale_id, field_data):
     """Update a collection item with translated content"""
     url = f"https://api.webflow.com/v2/collections/{collection_id}/items/{item_id}"
-    headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}",
-        "content-type": "application/json"
-    }
+    headers = {"content-type": "application/json"}
     
     # Prepare the payload
     payload = {
@@ -177,9 +214,9 @@ def update_collection_item(collection_id, item_id, api_key, cms_locale_id, field
     }
     
     try:
-        response = requests.patch(url, headers=headers, json=payload)
+        response = get_webflow_session(api_key).patch(url, headers=headers, data=orjson.dumps(payload))
         response.raise_for_status()
-        return response.json(), None
+        return jloads(response.content), None
     except Exception as e:
         return None, f"Error updating translation: {str(e)}"
 
@@ -197,51 +234,289 @@ def generate_curl_command(collection_id, item_id, api_key, cms_locale_id, field_
     curl_command = f"""curl -X PATCH "https://api.webflow.com/v2/collections/{collection_id}/items/{item_id}" \\
      -H "Authorization: Bearer {api_key}" \\
      -H "Content-Type: application/json" \\
-     -d '{json.dumps(payload, ensure_ascii=False)}'"""
+     -d '{jdumps(payload)}'"""
     
     return curl_command
 
-def translate_with_openai(text, target_language, api_key):
-    """Translate text using OpenAI"""
+# Translated field texts are cached on disk for 7 days, with the most recent ones also kept in memory
+TRANSLATION_CACHE_PATH = ".cms_translate_cache.sqlite3"
+TRANSLATION_CACHE_TTL = 86400 * 7
+MEMORY_CACHE_SIZE = 4096
+# OpenAI model used for field translations
+TRANSLATION_MODEL = "gpt-4o-mini"
+# Bump when the translation prompt changes so old cached translations are not reused
+PROMPT_VERSION = 1
+
+class TranslationCache:
+    """SQLite-backed cache of translated texts keyed on (model, target language, prompt version, text), fronted by an in-memory LRU"""
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, value TEXT NOT NULL, ts INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def key(text, target_language, model):
+        return hashlib.sha256(f"{model}|{target_language}|{PROMPT_VERSION}|{text}".encode()).hexdigest()
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > MEMORY_CACHE_SIZE:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+            row = self._conn.execute(
+                "SELECT value FROM translations WHERE key = ? AND ts > ?",
+                (key, int(time.time()) - TRANSLATION_CACHE_TTL)
+            ).fetchone()
+            if row:
+                self._remember(key, row[0])
+        return row[0] if row else None
+
+    def set(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (key, value, ts) VALUES (?, ?, ?)",
+                (key, value, int(time.time()))
+            )
+            self._conn.commit()
+
+@st.cache_resource
+def get_translation_cache():
+    """Get the process-wide translation cache"""
+    return TranslationCache(TRANSLATION_CACHE_PATH)
+
+# Banner line around each translation request in the logs, built once
+LOG_SEPARATOR = "=" * 50
+
+# Bound concurrent OpenAI requests (one per language) so a many-locale pass stays under the rate limit
+MAX_CONCURRENT_TRANSLATIONS = 8
+
+async def translate_with_openai_async(fields, target_language, client, semaphore):
+    """Translate a {key: text} dict of fields in one OpenAI request, returning ({key: translated_text}, error)"""
     try:
-        logger.info(f"\n{'='*50}\nTRANSLATING TO {target_language}\n{'='*50}")
-        logger.info(f"Original text:\n{text[:200]}..." if len(text) > 200 else text)
-        
-        client = openai.OpenAI(api_key=api_key)
+        logger.info("\n%s\nTRANSLATING %d FIELDS TO %s\n%s", LOG_SEPARATOR, len(fields), target_language, LOG_SEPARATOR)
         
         system_message = f"""You are a professional translator with 20 years of experience.
-        Translate the text to {target_language}.
+        Translate each string value in the given JSON object to {target_language}.
         Follow these rules when translating:
         - When encountering the word "Deriv" and any succeeding word, keep it in English. For example, "Deriv Blog," "Deriv Life," "Deriv Bot," and "Deriv App" should be kept in English.
         - Keep product names such as P2P, MT5, Deriv X, Deriv cTrader, SmartTrader, Deriv Trader, Deriv GO, Deriv Bot, and Binary Bot in English.
-        Return only the translation, no explanations."""
+        Return a JSON object with exactly the same keys, no explanations."""
         
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": text}
-            ],
-            temperature=0.3
-        )
+        async with semaphore:
+            response = await client.chat.completions.create(
+                model=TRANSLATION_MODEL,
+                messages=[
+                    {"role": "system", "content": system_message},
+                    {"role": "user", "content": jdumps(fields)}
+                ],
+                temperature=0.3,
+                response_format={"type": "json_object"}
+            )
         
-        translated_text = response.choices[0].message.content.strip()
-        logger.info(f"Translated text:\n{translated_text[:200]}..." if len(translated_text) > 200 else translated_text)
-        logger.info(f"{'='*50}\n")
+        translated_fields = jloads(response.choices[0].message.content)
+        missing = [key for key in fields if not isinstance(translated_fields.get(key), str)]
+        if missing:
+            return None, f"Translation is missing fields: {', '.join(missing)}"
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Translated fields: %s\n%s\n", ", ".join(fields), LOG_SEPARATOR)
         
-        return translated_text, None
+        return {key: translated_fields[key].strip() for key in fields}, None
     except Exception as e:
-        logger.error(f"Translation error: {str(e)}")
+        logger.error("Translation error: %s", e)
         return None, f"Translation error: {str(e)}"
 
-def execute_curl_command(collection_id, item_id, api_key, cms_locale_id, field_data):
+# Product names the prompt keeps in English; a field made only of these round-trips unchanged
+KEEP_IN_ENGLISH = [
+    "Deriv cTrader", "Deriv Trader", "Deriv Blog", "Deriv Life", "Deriv Bot", "Deriv App",
+    "Deriv GO", "Deriv X", "SmartTrader", "Binary Bot", "Deriv", "MT5", "P2P"
+]
+
+# Values that need no translation: blank, numbers and punctuation, URLs, or only kept product names
+UNTRANSLATABLE_RE = re.compile(
+    r"[\s\d\W]*|https?://\S+|(?:(?:%s)(?![\w])[\s\W]*)+" % "|".join(map(re.escape, KEEP_IN_ENGLISH))
+)
+
+def needs_translation(value):
+    """Check whether a field value has anything OpenAI would actually translate"""
+    return not UNTRANSLATABLE_RE.fullmatch(value.strip())
+
+def get_translatable_items(data, config):
+    """Get the (key, value) pairs of an item's string fields that should be translated"""
+    return [
+        (key, value) for key, value in data.items()
+        if isinstance(value, str) and key not in config['fields_to_preserve']
+    ]
+
+# Optional local NLLB translator for short plain-text fields, enabled with TRANSLATION_BACKEND=nllb
+# when transformers and torch are installed; everything else still goes to OpenAI
+NLLB_MODEL = "facebook/nllb-200-distilled-600M"
+NLLB_MAX_CHARS = 1000
+NLLB_LANGUAGE_CODES = {
+    "ar": "arb_Arab", "bn": "ben_Beng", "de": "deu_Latn", "es": "spa_Latn", "fr": "fra_Latn",
+    "id": "ind_Latn", "it": "ita_Latn", "ko": "kor_Hang", "km": "khm_Khmr", "mn": "khk_Cyrl",
+    "pl": "pol_Latn", "pt": "por_Latn", "ru": "rus_Cyrl", "si": "sin_Sinh", "sw": "swh_Latn",
+    "th": "tha_Thai", "tr": "tur_Latn", "uz": "uzn_Latn", "vi": "vie_Latn",
+    "zh": "zho_Hans", "zh-cn": "zho_Hans", "zh-tw": "zho_Hant"
+}
+
+def nllb_enabled():
+    """Check whether the NLLB backend was requested and its libraries are installed"""
+    return (
+        os.getenv("TRANSLATION_BACKEND", "").lower() == "nllb"
+        and importlib.util.find_spec("transformers") is not None
+        and importlib.util.find_spec("torch") is not None
+    )
+
+def nllb_language_code(language_code):
+    """Map a locale tag like 'pt-BR' to its NLLB code, or None when NLLB doesn't cover it"""
+    tag = language_code.lower()
+    return NLLB_LANGUAGE_CODES.get(tag) or NLLB_LANGUAGE_CODES.get(tag.split('-')[0])
+
+def nllb_can_translate(value):
+    """Check whether a value is short plain text without product names, which NLLB can't be told to keep"""
+    return len(value) <= NLLB_MAX_CHARS and '<' not in value and not any(term in value for term in KEEP_IN_ENGLISH)
+
+@st.cache_resource(show_spinner="Loading the NLLB translation model...")
+def get_nllb_translator():
+    """Load the NLLB tokenizer and model once per process, on the GPU when one is available"""
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+    
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    tokenizer = AutoTokenizer.from_pretrained(NLLB_MODEL, src_lang="eng_Latn")
+    model = AutoModelForSeq2SeqLM.from_pretrained(NLLB_MODEL).to(device).eval()
+    # generate() isn't safe to run concurrently on one model, so languages take turns
+    return tokenizer, model, device, threading.Lock()
+
+def translate_with_nllb(texts, nllb_code, translator):
+    """Translate a list of texts with NLLB in a single batched generate call"""
+    import torch
+    
+    tokenizer, model, device, lock = translator
+    inputs = tokenizer(texts, padding=True, truncation=True, return_tensors="pt").to(device)
+    with lock, torch.inference_mode():
+        outputs = model.generate(
+            **inputs,
+            forced_bos_token_id=tokenizer.convert_tokens_to_ids(nllb_code),
+            max_new_tokens=512
+        )
+    return [text.strip() for text in tokenizer.batch_decode(outputs, skip_special_tokens=True)]
+
+async def translate_fields_with_nllb(fields, nllb_code, translator):
+    """Translate a {key: text} dict of fields with NLLB off the event loop, returning ({key: translated_text}, error)"""
+    try:
+        translated = await asyncio.to_thread(translate_with_nllb, list(fields.values()), nllb_code, translator)
+        return dict(zip(fields, translated)), None
+    except Exception as e:
+        logger.error("NLLB translation error: %s", e)
+        return None, f"NLLB translation error: {str(e)}"
+
+async def translate_fields(translatable_items, target_language, client, semaphore, cache, nllb_translator=None):
+    """Translate the fields to one language, returning {key: (translated_text, error)}.
+    
+    Cached fields are served locally and the rest are sent together in a single request,
+    with fields that share a value sending it only once."""
+    results, misses = {}, {}
+    # Fields whose value is already pending under another key, mapped to that key
+    duplicates, key_by_value = {}, {}
+    for key, value in translatable_items:
+        # Keep values that would come back unchanged without an API call
+        if not needs_translation(value):
+            results[key] = (value, None)
+            continue
+        if value in key_by_value:
+            duplicates[key] = key_by_value[value]
+            continue
+        cached = cache.get(cache.key(value, target_language, TRANSLATION_MODEL))
+        if cached is None and nllb_translator is not None:
+            cached = cache.get(cache.key(value, target_language, NLLB_MODEL))
+        if cached is not None:
+            results[key] = (cached, None)
+        else:
+            misses[key] = value
+        key_by_value[value] = key
+    logger.info(
+        "Translation cache for %s: %d hits, %d misses, %d duplicates",
+        target_language, len(results), len(misses), len(duplicates)
+    )
+    
+    # Send short plain-text fields to the local model when it covers this language
+    nllb_code = nllb_language_code(target_language) if nllb_translator is not None else None
+    nllb_fields = {key: value for key, value in misses.items() if nllb_code and nllb_can_translate(value)}
+    if nllb_fields:
+        translated_fields, error = await translate_fields_with_nllb(nllb_fields, nllb_code, nllb_translator)
+        if not error:
+            for key, value in nllb_fields.items():
+                results[key] = (translated_fields[key], None)
+                cache.set(cache.key(value, target_language, NLLB_MODEL), translated_fields[key])
+                del misses[key]
+        # On failure the fields simply stay in misses and fall back to OpenAI
+    
+    if misses:
+        translated_fields, error = await translate_with_openai_async(misses, target_language, client, semaphore)
+        for key, value in misses.items():
+            if error:
+                results[key] = (None, error)
+            else:
+                results[key] = (translated_fields[key], None)
+                cache.set(cache.key(value, target_language, TRANSLATION_MODEL), translated_fields[key])
+    
+    # Fill in the duplicate fields from the field that carried their value
+    for key, original_key in duplicates.items():
+        results[key] = results[original_key]
+    return results
+
+@st.cache_resource
+def get_event_loop():
+    """Get a process-wide event loop running in a background thread, so async clients outlive a script run"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True, name="openai-event-loop").start()
+    return loop
+
+@st.cache_resource
+def get_openai_client(api_key):
+    """Get a keep-alive async OpenAI client, reused by every translation on the background event loop"""
+    # openai pulls in httpx and pydantic, so import it only once a translation actually runs
+    import openai
+    return openai.AsyncOpenAI(api_key=api_key)
+
+async def translate_all_fields(translatable_items, language_codes, client, cache, nllb_translator=None):
+    """Translate the fields to all languages concurrently, sharing one semaphore across languages"""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSLATIONS)
+    results = await asyncio.gather(*(
+        translate_fields(translatable_items, language_code, client, semaphore, cache, nllb_translator)
+        for language_code in language_codes
+    ))
+    return dict(zip(language_codes, results))
+
+def translate_fields_to_languages(translatable_items, language_codes, api_key):
+    """Translate the fields to all languages, returning {language_code: {key: (translated_text, error)}}"""
+    # Resolve the cached resources on the script thread; the coroutines run on the background loop
+    client = get_openai_client(api_key)
+    cache = get_translation_cache()
+    nllb_translator = get_nllb_translator() if nllb_enabled() else None
+    return asyncio.run_coroutine_threadsafe(
+        translate_all_fields(translatable_items, language_codes, client, cache, nllb_translator),
+        get_event_loop()
+    ).result()
+
+def execute_curl_command(collection_id, item_id, api_key, cms_locale_id, field_data, session=None):
     """Execute the PATCH request and return response"""
+    if session is None:
+        session = get_webflow_session(api_key)
     url = f"https://api.webflow.com/v2/collections/{collection_id}/items/{item_id}"
-    headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}",
-        "content-type": "application/json"
-    }
+    headers = {"content-type": "application/json"}
     
     payload = {
         "isArchived": False,
@@ -251,11 +526,11 @@ def execute_curl_command(collection_id, item_id, api_key, cms_locale_id, field_d
     }
     
     try:
-        response = requests.patch(url, headers=headers, json=payload)
+        response = session.patch(url, headers=headers, data=orjson.dumps(payload))
         response.raise_for_status()
         return {
             'status_code': response.status_code,
-            'response': response.json(),
+            'response': jloads(response.content),
             'error': None
         }
     except Exception as e:
@@ -265,22 +540,239 @@ def execute_curl_command(collection_id, item_id, api_key, cms_locale_id, field_d
             'error': str(e)
         }
 
-def get_collections(site_id, api_key):
-    """Get list of collections from the site"""
-    url = f"https://api.webflow.com/v2/sites/{site_id}/collections"
-    headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}"
+# Statuses the async PATCH path retries with exponential backoff, honoring Retry-After
+PATCH_RETRIES = 3
+PATCH_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+@st.cache_resource
+def get_webflow_async_client(api_key):
+    """Get a keep-alive async Webflow client, multiplexing requests over HTTP/2 when h2 is installed"""
+    # httpx is already installed with openai; import it only once an update actually runs
+    import httpx
+    return httpx.AsyncClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        timeout=30,
+        headers={
+            "accept": "application/json",
+            "authorization": f"Bearer {api_key}",
+            "content-type": "application/json"
+        }
+    )
+
+async def fetch_locale_field_data_async(client, collection_id, item_id, cms_locale_id):
+    """Fetch the item's live field data for a CMS locale, or None when it can't be read"""
+    url = f"https://api.webflow.com/v2/collections/{collection_id}/items/{item_id}"
+    
+    try:
+        response = await client.get(url, params={"cmsLocaleId": cms_locale_id})
+        response.raise_for_status()
+        return jloads(response.content).get('fieldData', {})
+    except Exception as e:
+        logger.warning("Couldn't fetch locale %s of item %s: %s", cms_locale_id, item_id, e)
+        return None
+
+async def execute_patch_async(client, collection_id, item_id, cms_locale_id, field_data):
+    """Execute the PATCH request on the shared async client and return response"""
+    url = f"https://api.webflow.com/v2/collections/{collection_id}/items/{item_id}"
+    
+    payload = {
+        "isArchived": False,
+        "isDraft": False,
+        "fieldData": field_data,
+        "cmsLocaleId": cms_locale_id
     }
     
     try:
-        response = requests.get(url, headers=headers)
+        for attempt in range(PATCH_RETRIES + 1):
+            response = await client.patch(url, content=orjson.dumps(payload))
+            if response.status_code not in PATCH_RETRY_STATUSES or attempt == PATCH_RETRIES:
+                break
+            retry_after = response.headers.get("retry-after", "")
+            await asyncio.sleep(float(retry_after) if retry_after.isdigit() else 0.3 * 2 ** attempt)
         response.raise_for_status()
-        return response.json().get('collections', [])
+        return {
+            'status_code': response.status_code,
+            'response': jloads(response.content),
+            'error': None
+        }
+    except Exception as e:
+        return {
+            'status_code': None,
+            'response': None,
+            'error': str(e)
+        }
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_collections(site_id, api_key_hash, _api_key):
+    """Fetch the list of collections of the site (cached, raises on failure)"""
+    url = f"https://api.webflow.com/v2/sites/{site_id}/collections"
+    
+    response = get_webflow_session(_api_key).get(url)
+    response.raise_for_status()
+    return jloads(response.content).get('collections', [])
+
+def get_collections(site_id, api_key):
+    """Get list of collections from the site"""
+    try:
+        return fetch_collections(site_id, api_key_digest(api_key), _api_key=api_key)
     except Exception as e:
         st.error(f"Error fetching collections: {str(e)}")
         return []
 
+def render_results(slot, results):
+    """Render one language's results into its slot, replacing whatever the slot showed before"""
+    with slot.container():
+        for result in results:
+            if result['status'] == 'success':
+                st.success(f"✅ {result['language']}: {result['message']}")
+            else:
+                st.error(f"❌ {result['language']}: {result['message']}")
+
+# PATCHes the All Languages job keeps in flight at once
+MAX_CONCURRENT_UPDATES = 4
+
+class TranslationJob:
+    """Progress of a background All Languages job, written by the event loop and read by the page"""
+    def __init__(self, item_id, locales):
+        self.item_id = item_id
+        self.locales = locales
+        self.stage = f"Translating to {len(locales)} languages..."
+        self.progress = 0.0
+        # One result list per language, created up front so the page can read it while the job appends
+        self.results = {locale['id']: [] for locale in locales}
+        self.cancel_event = threading.Event()
+        self.finished = False
+        self.cancelled = False
+        self.error = None
+
+    def add_result(self, locale, status, message):
+        self.results[locale['id']].append({'language': locale['name'], 'status': status, 'message': message})
+
+async def run_all_languages_job(job, collection_id, data, translatable_items, client, cache, nllb_translator, webflow_client):
+    """Translate the item to every language and PATCH each locale, recording progress on the job"""
+    try:
+        # Translate every field to every language in one concurrent pass, checking for Cancel meanwhile
+        translation = asyncio.ensure_future(translate_all_fields(
+            translatable_items, [locale['code'] for locale in job.locales], client, cache, nllb_translator
+        ))
+        while not translation.done():
+            if job.cancel_event.is_set():
+                translation.cancel()
+                job.cancelled = True
+                return
+            await asyncio.wait({translation}, timeout=0.2)
+        all_translations = translation.result()
+        if job.cancel_event.is_set():
+            job.cancelled = True
+            return
+        
+        # Read every locale's live content, so updates that would change nothing are skipped
+        live_field_data = await asyncio.gather(*(
+            fetch_locale_field_data_async(webflow_client, collection_id, job.item_id, locale['id'])
+            for locale in job.locales
+        ))
+        
+        # Build each language's field data, keeping the original text for failed fields
+        locale_updates = []
+        for locale, live in zip(job.locales, live_field_data):
+            current_translations = {}
+            language_translations = all_translations[locale['code']]
+            
+            # Collect each field's translation
+            for key, value in data.items():
+                if key in language_translations:
+                    translated_text, error = language_translations[key]
+                    if error:
+                        job.add_result(locale, 'error', f"Error translating {key}: {error}")
+                        translated_text = value
+                    current_translations[key] = translated_text
+                else:
+                    current_translations[key] = value
+            
+            # Skip the update when the locale in Webflow already has exactly this content
+            if live is not None and all(live.get(key) == value for key, value in current_translations.items()):
+                job.add_result(locale, 'success', 'Already up to date, update skipped')
+            else:
+                locale_updates.append((locale, current_translations))
+        
+        # Only a few updates are in flight at once, so Cancel is checked each time one finishes
+        update_slots = asyncio.Semaphore(MAX_CONCURRENT_UPDATES)
+        
+        async def update_locale(locale, field_data):
+            async with update_slots:
+                # A cancelled job doesn't start any more updates
+                if job.cancel_event.is_set():
+                    return locale, None
+                return locale, await execute_patch_async(webflow_client, collection_id, job.item_id, locale['id'], field_data)
+        
+        # Execute the updates for all languages concurrently
+        job.stage = f"Updating {len(locale_updates)} languages..."
+        for done, update in enumerate(asyncio.as_completed([
+            update_locale(locale, field_data) for locale, field_data in locale_updates
+        ]), 1):
+            locale, result = await update
+            job.progress = done / len(locale_updates)
+            if result is None:
+                job.cancelled = True
+                job.add_result(locale, 'error', 'Update cancelled')
+                continue
+            job.add_result(
+                locale,
+                'success' if not result['error'] else 'error',
+                result['error'] if result['error'] else 'Translation completed successfully'
+            )
+    except Exception as e:
+        logger.error("All Languages job failed: %s", e)
+        job.error = f"Translation job failed: {str(e)}"
+    finally:
+        job.finished = True
+
+def start_all_languages_job(collection_id, selected_data, config, locales):
+    """Start translating and updating an item for all languages on the background loop, returning its job"""
+    job = TranslationJob(selected_data['id'], locales)
+    # Resolve the cached resources on the script thread; the job itself runs on the background loop
+    asyncio.run_coroutine_threadsafe(
+        run_all_languages_job(
+            job,
+            collection_id,
+            selected_data['data'],
+            get_translatable_items(selected_data['data'], config),
+            get_openai_client(st.session_state.openai_key),
+            get_translation_cache(),
+            get_nllb_translator() if nllb_enabled() else None,
+            get_webflow_async_client(st.session_state.api_key)
+        ),
+        get_event_loop()
+    )
+    return job
+
+def render_translation_job(job):
+    """Render the progress and per-language results of an All Languages job"""
+    if job.finished:
+        if job.cancelled:
+            st.warning("Translation job cancelled")
+        elif job.error:
+            st.error(job.error)
+        else:
+            st.success("All translations completed!")
+    else:
+        st.progress(job.progress)
+        st.info(job.stage)
+        if st.button("Cancel", key="cancel_translation_job"):
+            job.cancel_event.set()
+    
+    st.write("Translation Results:")
+    for locale_results in job.results.values():
+        render_results(st.empty(), locale_results)
+    
+    # Once the job is done, rerun the page so the results stop polling
+    if job.finished and st.session_state.get('translation_job_polling'):
+        st.session_state.translation_job_polling = False
+        st.rerun()
+
+# Renders the running job twice a second, without rerunning the page
+poll_translation_job = st.fragment(render_translation_job, run_every=0.5)
+
 def main():
     st.title("J.Jonah Jameson - Get it to the front page")
     
@@ -311,16 +803,18 @@ def main():
     with st.spinner("Fetching collections..."):
         collections = get_collections(st.session_state.site_id, st.session_state.api_key)
         if collections:
-            collection_options = [f"{col['displayName']} ({col['id']})" for col in collections]
-            selected_collection = st.selectbox(
+            # Options are the collection IDs themselves; the labels are only used for display
+            collections_by_id = {col['id']: col for col in collections}
+            collection_id = st.selectbox(
                 "Select Collection",
-                options=collection_options,
+                options=list(collections_by_id),
+                format_func=lambda col_id: f"{collections_by_id[col_id]['displayName']} ({col_id})",
                 help="Choose the collection you want to manage"
             )
             
-            if selected_collection:
+            if collection_id:
                 # Get collection type and config
-                collection_name = selected_collection.split('(')[0].strip()
+                collection_name = collections_by_id[collection_id]['displayName']
                 collection_type, config = get_collection_config(collection_name)
                 
                 if not config:
@@ -329,8 +823,7 @@ def main():
                 
                 st.write(f"Processing {config['display_name']} collection")
                 
-                # Extract collection ID and fetch items
-                collection_id = selected_collection.split('(')[-1].strip(')')
+                # Fetch the collection's items
                 with st.spinner("Fetching collection items..."):
                     items = get_collection_items(
                         st.session_state.site_id,
@@ -341,20 +834,22 @@ def main():
                     if items and 'items' in items:
                         # Parse items based on collection type
                         parsed_items = parse_collection_items(items['items'], collection_type, config)
+                        items_by_slug = {item['slug']: item for item in parsed_items}
                         
-                        selected_item = st.selectbox(
+                        # None stands for 'All'; every other option is an item slug
+                        selected_slug = st.selectbox(
                             f"Select {config['display_name']} (Total: {len(parsed_items)})",
-                            options=['All'] + [f"{item['identifier']} ({item['slug']})" for item in parsed_items]
+                            options=[None] + list(items_by_slug),
+                            format_func=lambda slug: 'All' if slug is None else f"{items_by_slug[slug]['identifier']} ({slug})"
                         )
                         
-                        if selected_item != 'All':
-                            selected_slug = selected_item.split('(')[-1].strip(')')
-                            selected_data = next(
-                                (item for item in parsed_items if item['slug'] == selected_slug),
-                                None
-                            )
+                        if selected_slug is not None:
+                            selected_data = items_by_slug.get(selected_slug)
                             
                             if selected_data:
+                                # Only the selected item's fields are filtered for translation
+                                selected_data['data'] = filter_field_data(selected_data['field_data'], config)
+                                
                                 st.subheader("Original Content")
                                 st.json(selected_data['data'])
                                 
@@ -370,16 +865,17 @@ def main():
                                 
                                 if translation_mode == "Single Language":
                                     # Single language translation logic
-                                    target_language = st.selectbox(
+                                    # Options are the locale dicts themselves, so nothing is parsed back out of the label
+                                    target_locale = st.selectbox(
                                         "Select target language",
-                                        options=[f"{locale['name']} ({locale['code']}) - {locale['id']}" 
-                                                for locale in cms_locales]
+                                        options=cms_locales,
+                                        format_func=lambda locale: f"{locale['name']} ({locale['code']}) - {locale['id']}"
                                     )
                                     
-                                    if target_language:
-                                        # Extract CMS Locale ID and language code
-                                        cms_locale_id = target_language.split(' - ')[-1]
-                                        language_code = target_language.split('(')[1].split(')')[0]
+                                    if target_locale:
+                                        # CMS Locale ID and language code of the selected locale
+                                        cms_locale_id = target_locale['id']
+                                        language_code = target_locale['code']
                                         
                                         # Display form with translations
                                         with st.form("translation_form"):
@@ -411,17 +907,17 @@ def main():
                                             
                                             if translate_button:
                                                 with st.spinner("Translating content..."):
-                                                    for key, value in selected_data['data'].items():
-                                                        if isinstance(value, str) and key not in config['fields_to_preserve']:
-                                                            translated_text, error = translate_with_openai(
-                                                                value,
-                                                                language_code,
-                                                                st.session_state.openai_key
-                                                            )
-                                                            if error:
-                                                                st.error(f"Error translating {key}: {error}")
-                                                            else:
-                                                                edited_fields[key] = translated_text
+                                                    # Translate all fields concurrently
+                                                    translations = translate_fields_to_languages(
+                                                        get_translatable_items(selected_data['data'], config),
+                                                        [language_code],
+                                                        st.session_state.openai_key
+                                                    )[language_code]
+                                                    for key, (translated_text, error) in translations.items():
+                                                        if error:
+                                                            st.error(f"Error translating {key}: {error}")
+                                                        else:
+                                                            edited_fields[key] = translated_text
                                             
                                             if update_button:
                                                 with st.spinner("Updating content..."):
@@ -439,77 +935,23 @@ def main():
                                                         st.success("✅ Content updated successfully!")
                                 
                                 else:  # All Languages mode
-                                    if st.button("Translate and Update All Languages"):
-                                        # Create a progress container
-                                        progress_container = st.empty()
-                                        status_container = st.empty()
-                                        results_container = st.container()
-                                        
-                                        # Initialize translation results
-                                        translation_results = []
-                                        
+                                    # The job runs on the background loop, so the page stays interactive meanwhile
+                                    job = st.session_state.get('translation_job')
+                                    job_running = job is not None and not job.finished
+                                    if st.button("Translate and Update All Languages", disabled=job_running):
                                         # Get non-default languages
                                         languages_to_translate = [l for l in cms_locales if not l.get('default', False)]
-                                        total_languages = len(languages_to_translate)
-                                        
-                                        for idx, locale in enumerate(languages_to_translate):
-                                            # Update progress (ensure it's between 0 and 1)
-                                            progress = min(idx / total_languages, 1.0)
-                                            progress_container.progress(progress)
-                                            
-                                            # Update status message
-                                            status_container.info(f"Translating to {locale['name']} ({locale['code']})...")
-                                            
-                                            # Store translations for this language
-                                            current_translations = {}
-                                            
-                                            # Translate each field
-                                            for key, value in selected_data['data'].items():
-                                                if isinstance(value, str) and key not in config['fields_to_preserve']:
-                                                    translated_text, error = translate_with_openai(
-                                                        value,
-                                                        locale['code'],
-                                                        st.session_state.openai_key
-                                                    )
-                                                    if error:
-                                                        translation_results.append({
-                                                            'language': locale['name'],
-                                                            'status': 'error',
-                                                            'message': f"Error translating {key}: {error}"
-                                                        })
-                                                        translated_text = value
-                                                    current_translations[key] = translated_text
-                                                else:
-                                                    current_translations[key] = value
-                                            
-                                            # Execute update for this language
-                                            result = execute_curl_command(
-                                                collection_id=collection_id,
-                                                item_id=selected_data['id'],
-                                                api_key=st.session_state.api_key,
-                                                cms_locale_id=locale['id'],
-                                                field_data=current_translations
-                                            )
-                                            
-                                            # Store result
-                                            translation_results.append({
-                                                'language': locale['name'],
-                                                'status': 'success' if not result['error'] else 'error',
-                                                'message': result['error'] if result['error'] else 'Translation completed successfully'
-                                            })
-                                            
-                                            # Update results in real-time
-                                            with results_container:
-                                                st.write("Translation Results:")
-                                                for result in translation_results:
-                                                    if result['status'] == 'success':
-                                                        st.success(f"✅ {result['language']}: {result['message']}")
-                                                    else:
-                                                        st.error(f"❌ {result['language']}: {result['message']}")
-                                        
-                                        # Clear progress and status when complete
-                                        progress_container.empty()
-                                        status_container.success("All translations completed!")
+                                        job = start_all_languages_job(collection_id, selected_data, config, languages_to_translate)
+                                        st.session_state.translation_job = job
+                                        job_running = True
+                                    
+                                    if job is not None and job.item_id == selected_data['id']:
+                                        # Poll the job's progress while it runs
+                                        if job_running:
+                                            st.session_state.translation_job_polling = True
+                                            poll_translation_job(job)
+                                        else:
+                                            render_translation_job(job)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file